@@ -1,39 +1,18 @@
-import glfw
-from OpenGL.GL import *
-
-def dda_line(x1, y1, x2, y2):
-    points = []
-    
-    dx = x2 - x1
-    dy = y2 - y1
-    
-    # Determine number of steps
-    steps = max(abs(dx), abs(dy))
-    
-    if steps == 0:
-        return [(x1, y1)]
-    
-    # Calculate increment for each step
-    x_inc = dx / steps
-    y_inc = dy / steps
-    
-    # Starting point
-    x, y = x1, y1
-    
-    for _ in range(int(steps) + 1):
-        points.append((round(x), round(y)))
-        x += x_inc
-        y += y_inc
-    
-    return points
+from lazy_gl import GL, glfw
+from raster.lines import dda_line
+from point_renderer import PointRenderer
+from render_loop import run
+import instrumentation
 
 def draw_line_points(points):
-    glBegin(GL_POINTS)
+    GL.glBegin(GL.GL_POINTS)
     for x, y in points:
-        glVertex2f(x, y)
-    glEnd()
+        GL.glVertex2f(x, y)
+    GL.glEnd()
 
 def main():
+    instrumentation.install(globals())
+    
     if not glfw.init():
         return
     
@@ -46,14 +25,14 @@ def main():
     
     glfw.make_context_current(window)
     
-    glViewport(0, 0, width, height)
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    glOrtho(0, width, height, 0, -1, 1)  # 2D orthographic projection
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
+    GL.glViewport(0, 0, width, height)
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glLoadIdentity()
+    GL.glOrtho(0, width, height, 0, -1, 1)  # 2D orthographic projection
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glLoadIdentity()
     
-    glPointSize(2.0)
+    GL.glPointSize(2.0)
     
     lines = [
         (100, 100, 700, 500),  # Diagonal line
@@ -65,20 +44,21 @@ def main():
     
     all_points = []
     for x1, y1, x2, y2 in lines:
-        points = dda_line(x1, y1, x2, y2)
+        points = dda_line(x1, y1, x2, y2, clip=(0, 0, width, height))
         all_points.extend(points)
     
-    while not glfw.window_should_close(window):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glClearColor(0.0, 0.0, 0.0, 1.0)
-        
-        glColor3f(1.0, 1.0, 1.0)
-        
-        draw_line_points(all_points)
+    renderer = PointRenderer()
+    renderer.add(all_points, (1.0, 1.0, 1.0))
+    
+    def draw_scene():
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        GL.glClearColor(0.0, 0.0, 0.0, 1.0)
         
-        glfw.swap_buffers(window)
-        glfw.poll_events()
+        renderer.draw()
+    
+    run(window, draw_scene)
     
+    renderer.delete()
     glfw.terminate()
 
 if __name__ == "__main__":
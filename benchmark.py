@@ -0,0 +1,256 @@
+import argparse
+import json
+import math
+import sys
+import time
+import timeit
+import tracemalloc
+from raster.lines import dda_line, bresenham_line
+from raster.circle import midpoint_circle
+from raster.ellipse import midpoint_ellipse, midpoint_ellipse_int
+from raster.graph import normalize_data, generate_graph_lines
+from raster.pie import create_pie_chart, pie_geometry, pie_sectors, pie_triangles
+
+BASELINE_PATH = 'benchmark_baseline.json'
+
+def time_call(func, args, repeat=5):
+    """
+    Best wall-clock time of func(*args) over repeat runs, with its result.
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def time_per_call(func, args, repeat=5, min_time=0.05):
+    """
+    Best seconds per call of func(*args). Each timed sample loops enough
+    calls to last at least min_time, so tiny cases are not lost in timer noise.
+    """
+    timer = timeit.Timer(lambda: func(*args))
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number
+
+def calibrate(repeat=5):
+    """
+    Seconds for a fixed pure-Python integer loop, stored with every report so
+    results from machines (or runs) of different speed can be compared.
+    """
+    def workload():
+        total = 0
+        for i in range(100000):
+            total += i * 2 if i & 1 else i
+        return total
+
+    return time_per_call(workload, (), repeat)
+
+def peak_allocation(func, args):
+    """
+    Peak bytes allocated by one call of func(*args), measured separately from
+    the timing runs because tracemalloc slows allocation down.
+    """
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_ellipse(radii, repeat=5):
+    """
+    Compare the float and integer mid-point ellipse for each (rx, ry).
+
+    Returns: list of dicts with both timings, the pixel count and whether
+    the two paths produced identical pixels.
+    """
+    rows = []
+    for rx, ry in radii:
+        float_time, float_points = time_call(midpoint_ellipse, (0, 0, rx, ry), repeat)
+        int_time, int_points = time_call(midpoint_ellipse_int, (0, 0, rx, ry), repeat)
+        rows.append({
+            'radii': (rx, ry),
+            'pixels': len(int_points),
+            'float_time': float_time,
+            'int_time': int_time,
+            'identical': float_points == int_points
+        })
+    return rows
+
+def graph_pipeline(data, algorithm):
+    points, _ = normalize_data(data, 1000, 700, 80)
+    return generate_graph_lines(points, algorithm)
+
+def pie_vertices(data):
+    # Geometry is memoized, so clear it to measure a real rebuild
+    pie_geometry.cache_clear()
+    labels = [str(i) for i in range(len(data))]
+    colors = [(1.0, 1.0, 1.0)] * len(data)
+    return create_pie_chart(data, labels, colors, 500, 350, 200)
+
+def pie_vertex_count(sectors):
+    return sum(sector['geometry'][2] for sector in sectors)
+
+def pie_buffer(data):
+    colors = [(1.0, 1.0, 1.0)] * len(data)
+    return pie_triangles(pie_sectors(data, 200), 500, 350, 200, colors)
+
+def benchmark_cases():
+    """
+    Parameter sweep as (name, func, args) or (name, func, args, count)
+    tuples. count(result) gives the number of pixels (or vertices) produced,
+    and defaults to len for funcs that return one item per pixel.
+    """
+    cases = []
+
+    for length in (100, 1000):
+        for degrees in (0, 30, 45, 60, 90):
+            angle = math.radians(degrees)
+            x2 = round(length * math.cos(angle))
+            y2 = round(length * math.sin(angle))
+            for name, func in (('dda_line', dda_line), ('bresenham_line', bresenham_line)):
+                cases.append((f'{name}/len={length}/deg={degrees}', func, (0, 0, x2, y2)))
+
+    for r in (10, 100, 1000):
+        cases.append((f'midpoint_circle/r={r}', midpoint_circle, (0, 0, r)))
+
+    for rx, ry in ((20, 10), (200, 100), (2000, 1000)):
+        cases.append((f'midpoint_ellipse/rx={rx}/ry={ry}', midpoint_ellipse, (0, 0, rx, ry)))
+        cases.append((f'midpoint_ellipse_int/rx={rx}/ry={ry}', midpoint_ellipse_int, (0, 0, rx, ry)))
+
+    for n in (100, 10000):
+        data = [(i, math.sin(i * 0.01) * 100) for i in range(n)]
+        for algorithm in ('bresenham', 'dda'):
+            cases.append((f'line_graph/{algorithm}/n={n}', graph_pipeline, (data, algorithm)))
+
+    for n in (5, 100, 1000):
+        data = [i % 7 + 1 for i in range(n)]
+        cases.append((f'create_pie_chart/sectors={n}', pie_vertices, (data,), pie_vertex_count))
+
+    for n in (1000, 100000):
+        data = [i % 7 + 1 for i in range(n)]
+        cases.append((f'pie_triangles/sectors={n}', pie_buffer, (data,)))
+
+    return cases
+
+def run_benchmarks(repeat=5, pattern=None):
+    results = {}
+    for name, func, args, *count in benchmark_cases():
+        if pattern and pattern not in name:
+            continue
+
+        pixels = (count[0] if count else len)(func(*args))
+        seconds = time_per_call(func, args, repeat)
+        results[name] = {
+            'pixels': pixels,
+            'seconds': seconds,
+            'pixels_per_sec': pixels / seconds if seconds > 0 else 0.0,
+            'peak_bytes': peak_allocation(func, args)
+        }
+    return results
+
+def compare(results, baseline, tolerance=0.25, speed=1.0):
+    """
+    Compare results with a baseline.
+
+    speed is the baseline's calibration time divided by the current one, so
+    throughput is judged relative to how fast this machine runs Python.
+
+    Returns: list of (name, message) regressions where throughput dropped or
+    peak allocation grew by more than the tolerance fraction.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        if current['pixels'] != base['pixels']:
+            regressions.append((name, f"pixel count {base['pixels']} -> {current['pixels']}"))
+
+        expected = base['pixels_per_sec'] * speed
+        if current['pixels_per_sec'] < expected * (1 - tolerance):
+            ratio = current['pixels_per_sec'] / expected
+            regressions.append((name, f"throughput at {ratio:.0%} of baseline"))
+
+        if current['peak_bytes'] > base['peak_bytes'] * (1 + tolerance):
+            ratio = current['peak_bytes'] / max(base['peak_bytes'], 1)
+            regressions.append((name, f"peak allocation at {ratio:.0%} of baseline"))
+
+    return regressions
+
+def print_results(results, baseline=None, speed=1.0):
+    print(f"{'benchmark':42s} {'pixels':>8s} {'Mpx/s':>8s} {'peak KiB':>9s} {'vs base':>8s}")
+    print("-" * 80)
+    for name, row in results.items():
+        base = (baseline or {}).get(name)
+        change = f"{row['pixels_per_sec'] / (base['pixels_per_sec'] * speed):7.2f}x" if base else ''
+        print(f"{name:42s} {row['pixels']:8d} {row['pixels_per_sec'] / 1e6:8.3f} "
+              f"{row['peak_bytes'] / 1024:9.1f} {change:>8s}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless rasterization benchmarks")
+    parser.add_argument('-o', '--output', help="write results to this JSON file")
+    parser.add_argument('-b', '--baseline', default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--update-baseline', action='store_true', help="overwrite the baseline with these results")
+    parser.add_argument('-r', '--repeat', type=int, default=5, help="timing runs per case (best is kept)")
+    parser.add_argument('-t', '--tolerance', type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument('-k', '--filter', help="only run cases whose name contains this string")
+    parser.add_argument('--ellipse', action='store_true', help="run the float vs integer ellipse comparison")
+    args = parser.parse_args(argv)
+
+    if args.ellipse:
+        radii = [(50, 30), (150, 100), (1000, 600), (10000, 7000), (40000, 25000)]
+        print(f"{'rx':>7s} {'ry':>7s} {'pixels':>8s} {'float ms':>10s} {'int ms':>10s} {'speedup':>8s}  identical")
+        print("-" * 66)
+        for row in bench_ellipse(radii, args.repeat):
+            rx, ry = row['radii']
+            speedup = row['float_time'] / row['int_time']
+            print(f"{rx:7d} {ry:7d} {row['pixels']:8d} {row['float_time'] * 1e3:10.3f} "
+                  f"{row['int_time'] * 1e3:10.3f} {speedup:7.2f}x  {row['identical']}")
+        return 0
+
+    calibration = calibrate(args.repeat)
+    results = run_benchmarks(args.repeat, args.filter)
+
+    try:
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored['results']
+        speed = stored['calibration'] / calibration
+    except FileNotFoundError:
+        baseline = None
+        speed = 1.0
+
+    print_results(results, baseline, speed)
+
+    report = {'python': sys.version.split()[0], 'calibration': calibration, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, speed)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for name, message in regressions:
+            print(f"  {name}: {message}")
+        return 1
+
+    print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
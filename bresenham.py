@@ -1,57 +1,32 @@
-import glfw
-from OpenGL.GL import *
-
-def bresenham_line(x1, y1, x2, y2):
-    points = []
-    
-    dx = abs(x2 - x1)
-    dy = abs(y2 - y1)
-    
-    x_step = 1 if x2 > x1 else -1
-    y_step = 1 if y2 > y1 else -1
-    
-    x, y = x1, y1
-    
-    # Case 1: |m| < 1
-    if dx > dy:
-        p = 2 * dy - dx  # Initial decision parameter
-        
-        for _ in range(dx + 1):
-            points.append((x, y))
-            
-            if p >= 0:
-                y += y_step
-                p += 2 * (dy - dx)
-            else:
-                p += 2 * dy
-            
-            x += x_step
-    
-    # Case 2: |m| >= 1
-    else:
-        p = 2 * dx - dy  # Initial decision parameter
-        
-        for _ in range(dy + 1):
-            points.append((x, y))
-            
-            if p >= 0:
-                x += x_step
-                p += 2 * (dx - dy)
-            else:
-                p += 2 * dx
-            
-            y += y_step
-    
-    return points
+from lazy_gl import GL, glfw
+from raster.lines import bresenham_line
+from point_renderer import PointRenderer
+from render_loop import run
+import instrumentation
 
 def draw_line_points(points, color=(1.0, 1.0, 1.0)):
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+    GL.glColor3f(*color)
+    GL.glBegin(GL.GL_POINTS)
     for x, y in points:
-        glVertex2f(x, y)
-    glEnd()
+        GL.glVertex2f(x, y)
+    GL.glEnd()
+
+def draw_line_runs(runs, steep, color=(1.0, 1.0, 1.0)):
+    GL.glColor3f(*color)
+    GL.glBegin(GL.GL_LINES)
+    for x, y, length in runs:
+        # Line endpoints sit on pixel edges so every pixel of the run is covered
+        if steep:
+            GL.glVertex2f(x + 0.5, y)
+            GL.glVertex2f(x + 0.5, y + length)
+        else:
+            GL.glVertex2f(x, y + 0.5)
+            GL.glVertex2f(x + length, y + 0.5)
+    GL.glEnd()
 
 def main():
+    instrumentation.install(globals())
+    
     if not glfw.init():
         return
     
@@ -64,14 +39,14 @@ def main():
     
     glfw.make_context_current(window)
     
-    glViewport(0, 0, width, height)
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    glOrtho(0, width, height, 0, -1, 1)  # 2D orthographic projection
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
+    GL.glViewport(0, 0, width, height)
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glLoadIdentity()
+    GL.glOrtho(0, width, height, 0, -1, 1)  # 2D orthographic projection
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glLoadIdentity()
     
-    glPointSize(3.0)
+    GL.glPointSize(3.0)
     
     lines = [
         #Gentle slopes (|m| < 1) - Red
@@ -95,23 +70,26 @@ def main():
     
     all_line_data = []
     for (x1, y1, x2, y2), color in lines:
-        points = bresenham_line(x1, y1, x2, y2)
+        points = bresenham_line(x1, y1, x2, y2, clip=(0, 0, width, height))
         all_line_data.append((points, color))
         
         # Print info about the line
         dx = abs(x2 - x1)
         dy = abs(y2 - y1)
     
-    while not glfw.window_should_close(window):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glClearColor(0.1, 0.1, 0.1, 1.0)
-        
-        for points, color in all_line_data:
-            draw_line_points(points, color)
+    renderer = PointRenderer()
+    for points, color in all_line_data:
+        renderer.add(points, color)
+    
+    def draw_scene():
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        GL.glClearColor(0.1, 0.1, 0.1, 1.0)
         
-        glfw.swap_buffers(window)
-        glfw.poll_events()
+        renderer.draw()
+    
+    run(window, draw_scene)
     
+    renderer.delete()
     glfw.terminate()
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+import struct
+import zlib
+import numpy as np
+
+def to_rgba8(color):
+    """
+    Convert a float (r, g, b) or (r, g, b, a) color in [0, 1] to RGBA bytes.
+    """
+    if len(color) == 3:
+        color = (*color, 1.0)
+    return np.clip(np.round(np.asarray(color, dtype=np.float64) * 255), 0, 255).astype(np.uint8)
+
+class Framebuffer:
+    """
+    Software RGBA render target for headless rasterization.
+
+    Pixels are stored row-major as a height x width x 4 uint8 array using the
+    same top-left origin as the demos' glOrtho(0, width, height, 0) setup.
+    """
+
+    def __init__(self, width, height, clear_color=(0.0, 0.0, 0.0, 1.0)):
+        self.width = width
+        self.height = height
+        self.pixels = np.empty((height, width, 4), dtype=np.uint8)
+        self.clear(clear_color)
+
+    def clear(self, color=(0.0, 0.0, 0.0, 1.0)):
+        self.pixels[:] = to_rgba8(color)
+
+    def plot(self, points, color=(1.0, 1.0, 1.0)):
+        """
+        Write a list or N x 2 array of (x, y) pixels in a single scatter.
+
+        Points outside the framebuffer are discarded.
+        """
+        points = np.asarray(points).reshape(-1, 2)
+        if not len(points):
+            return
+
+        x = points[:, 0].astype(np.intp)
+        y = points[:, 1].astype(np.intp)
+
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        self.pixels[y[inside], x[inside]] = to_rgba8(color)
+
+    def fill_spans(self, spans, color=(1.0, 1.0, 1.0)):
+        """
+        Fill (y, x_left, x_right) spans with both ends inclusive.
+        """
+        spans = np.asarray(spans).reshape(-1, 3).astype(np.intp)
+
+        # Clip spans to the framebuffer and drop the ones left empty
+        y = spans[:, 0]
+        x_left = np.maximum(spans[:, 1], 0)
+        x_right = np.minimum(spans[:, 2], self.width - 1)
+        keep = (y >= 0) & (y < self.height) & (x_left <= x_right)
+        y, x_left, x_right = y[keep], x_left[keep], x_right[keep]
+        if not len(y):
+            return
+
+        lengths = x_right - x_left + 1
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        x = np.repeat(x_left, lengths) + np.arange(lengths.sum()) - starts
+
+        self.pixels[np.repeat(y, lengths), x] = to_rgba8(color)
+
+    def rgb(self):
+        return self.pixels[:, :, :3]
+
+    def save_ppm(self, path):
+        with open(path, 'wb') as f:
+            f.write(b'P6\n%d %d\n255\n' % (self.width, self.height))
+            f.write(np.ascontiguousarray(self.rgb()).tobytes())
+
+    def save_png(self, path):
+        # Filter type 0 (None) prefixed to every scanline
+        raw = np.empty((self.height, self.width * 4 + 1), dtype=np.uint8)
+        raw[:, 0] = 0
+        raw[:, 1:] = self.pixels.reshape(self.height, -1)
+
+        def chunk(tag, data):
+            body = tag + data
+            return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xFFFFFFFF)
+
+        header = struct.pack('>IIBBBBB', self.width, self.height, 8, 6, 0, 0, 0)
+
+        with open(path, 'wb') as f:
+            f.write(b'\x89PNG\r\n\x1a\n')
+            f.write(chunk(b'IHDR', header))
+            f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+            f.write(chunk(b'IEND', b''))
+
+    def save(self, path):
+        if path.lower().endswith('.ppm'):
+            self.save_ppm(path)
+        else:
+            self.save_png(path)
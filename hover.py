@@ -0,0 +1,49 @@
+from lazy_gl import glfw
+
+class HoverTracker:
+    """
+    Wires GLFW cursor callbacks to a hit-testing function.
+
+    lookup(x, y) is called with the cursor in scene coordinates (the
+    width x height space the demos' glOrtho maps to their viewport) and
+    on_hover(item) runs only when its result changes, e.g. to show a
+    tooltip. Leaving the window reports None.
+    """
+
+    def __init__(self, window, width, height, lookup, on_hover):
+        self.window = window
+        self.width = width
+        self.height = height
+        self.lookup = lookup
+        self.on_hover = on_hover
+        self.current = None
+
+        glfw.set_cursor_pos_callback(window, self._on_cursor)
+        glfw.set_cursor_enter_callback(window, self._on_enter)
+
+    def _on_cursor(self, window, x, y):
+        # The demos set glViewport(0, 0, width, height) once, so after a
+        # resize the scene keeps its size in framebuffer pixels, anchored
+        # to the bottom-left corner; the cursor is in screen coordinates
+        # from the top-left, which differ from framebuffer pixels on HiDPI
+        window_width, window_height = glfw.get_window_size(window)
+        framebuffer_width, framebuffer_height = glfw.get_framebuffer_size(window)
+        if window_width and window_height:
+            x *= framebuffer_width / window_width
+            y *= framebuffer_height / window_height
+        self.update(self.lookup(x, y - (framebuffer_height - self.height)))
+
+    def _on_enter(self, window, entered):
+        if not entered:
+            self.update(None)
+
+    def update(self, item):
+        if item != self.current:
+            self.current = item
+            self.on_hover(item)
+
+def show_tooltip(window, title, text=None):
+    """
+    Show a tooltip in the window title, the demos having no text rendering.
+    """
+    glfw.set_window_title(window, f"{title} - {text}" if text else title)
@@ -0,0 +1,159 @@
+import atexit
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from lazy_gl import LazyModule
+
+# Set to 1 to print a summary to stderr on exit, or to a file path to write it there
+ENV_VAR = 'RASTER_INSTRUMENT'
+
+# Upper bounds of the frame time histogram buckets in milliseconds
+FRAME_BUCKETS_MS = (1, 2, 4, 8, 16, 33, 66, 133)
+
+GL_FUNCTION = re.compile(r'^gl[A-Z]')
+
+class Stats:
+    """
+    Frame timings plus GL call and vertex counts per draw function.
+
+    GL calls are attributed to the innermost draw function on the scope
+    stack, or to '(other)' when they happen outside any of them.
+    """
+
+    def __init__(self):
+        self.draw_times = []
+        self.swap_times = []
+        self.scope_calls = defaultdict(int)
+        self.scope_time = defaultdict(float)
+        self.gl_calls = defaultdict(lambda: defaultdict(int))
+        self.vertices = defaultdict(int)
+        self._stack = ['(other)']
+
+    def record_frame(self, draw_time, swap_time):
+        self.draw_times.append(draw_time)
+        self.swap_times.append(swap_time)
+
+    def count_gl(self, name, args):
+        scope = self._stack[-1]
+        self.gl_calls[scope][name] += 1
+
+        if name.startswith('glVertex'):
+            self.vertices[scope] += 1
+        elif name == 'glDrawArrays':
+            self.vertices[scope] += args[2]
+        elif name == 'glDrawElements':
+            self.vertices[scope] += args[1]
+
+    def wrap_gl(self, name, func):
+        def counted(*args, **kwargs):
+            self.count_gl(name, args)
+            return func(*args, **kwargs)
+        counted.__wrapped__ = func
+        return counted
+
+    def wrap_scope(self, name, func):
+        def timed(*args, **kwargs):
+            self._stack.append(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.scope_time[name] += time.perf_counter() - start
+                self.scope_calls[name] += 1
+                self._stack.pop()
+        timed.__wrapped__ = func
+        timed.__name__ = getattr(func, '__name__', name)
+        return timed
+
+    def summary(self):
+        lines = []
+        frames = len(self.draw_times)
+        lines.append(f"Frames: {frames}")
+
+        if frames:
+            totals = [d + s for d, s in zip(self.draw_times, self.swap_times)]
+            for label, values in (('draw', self.draw_times), ('swap', self.swap_times), ('frame', totals)):
+                ms = sorted(v * 1e3 for v in values)
+                p50 = ms[len(ms) // 2]
+                p95 = ms[min(int(len(ms) * 0.95), len(ms) - 1)]
+                lines.append(f"  {label:5s} ms  p50 {p50:8.3f}  p95 {p95:8.3f}  max {ms[-1]:8.3f}")
+
+            counts = [0] * (len(FRAME_BUCKETS_MS) + 1)
+            for t in totals:
+                ms = t * 1e3
+                bucket = next((i for i, bound in enumerate(FRAME_BUCKETS_MS) if ms < bound), len(FRAME_BUCKETS_MS))
+                counts[bucket] += 1
+
+            lines.append("Frame time histogram:")
+            lower = 0
+            for bound, count in zip(FRAME_BUCKETS_MS + (None,), counts):
+                label = f"{lower}-{bound} ms" if bound else f">= {lower} ms"
+                bar = '#' * max(1 if count else 0, round(40 * count / frames))
+                lines.append(f"  {label:>12s} {count:7d} {bar}")
+                lower = bound
+
+        lines.append("Draw functions:")
+        lines.append(f"  {'name':28s} {'calls':>8s} {'total ms':>10s} {'GL calls':>10s} {'vertices':>10s}")
+        scopes = sorted(set(self.scope_calls) | set(self.gl_calls), key=lambda s: -self.scope_time[s])
+        for scope in scopes:
+            gl_total = sum(self.gl_calls[scope].values())
+            lines.append(f"  {scope:28s} {self.scope_calls[scope]:8d} {self.scope_time[scope] * 1e3:10.1f} "
+                         f"{gl_total:10d} {self.vertices[scope]:10d}")
+            top = sorted(self.gl_calls[scope].items(), key=lambda item: -item[1])[:5]
+            if top:
+                lines.append("      " + ", ".join(f"{name} x{count}" for name, count in top))
+
+        return "\n".join(lines)
+
+    def dump(self, target=None):
+        target = target if target is not None else os.environ.get(ENV_VAR, '1')
+        text = self.summary() + "\n"
+        if target == '1':
+            sys.stderr.write(text)
+        else:
+            with open(target, 'w') as f:
+                f.write(text)
+
+def enabled():
+    return os.environ.get(ENV_VAR, '') not in ('', '0')
+
+# Shared by every module; None unless instrumentation is enabled
+stats = Stats() if enabled() else None
+
+if stats is not None:
+    atexit.register(stats.dump)
+
+def install(namespace):
+    """
+    Instrument a module namespace in place, typically with install(globals()).
+
+    Every OpenGL function reached through it (via the lazy GL proxy or a
+    star import) is wrapped to count calls and vertices, and every draw_*
+    function (and draw method of a class defined there) is wrapped to time it
+    and attribute GL calls to it. Does nothing unless the RASTER_INSTRUMENT
+    environment variable is set.
+    """
+    if stats is None or namespace.get('__instrumented__'):
+        return
+
+    module = namespace.get('__name__')
+
+    def wrap_attribute(name, value):
+        if GL_FUNCTION.match(name) and callable(value):
+            return stats.wrap_gl(name, value)
+        return value
+
+    for name, value in list(namespace.items()):
+        if isinstance(value, LazyModule):
+            if value._name == 'OpenGL.GL' and value._wrapper is None:
+                value.set_wrapper(wrap_attribute)
+        elif GL_FUNCTION.match(name) and callable(value):
+            namespace[name] = stats.wrap_gl(name, value)
+        elif name.startswith('draw_') and callable(value):
+            namespace[name] = stats.wrap_scope(name, value)
+        elif isinstance(value, type) and value.__module__ == module and 'draw' in vars(value):
+            setattr(value, 'draw', stats.wrap_scope(f"{name}.draw", value.draw))
+
+    namespace['__instrumented__'] = True
@@ -0,0 +1,46 @@
+import importlib
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+
+    The demos reach OpenGL and GLFW through these proxies, so importing them
+    (or the raster package) in a headless process never loads PyOpenGL or
+    the GLFW shared library; that only happens once a window is created.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_wrapper'] = None
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+
+        value = getattr(module, attr)
+        if self._wrapper is not None:
+            value = self._wrapper(attr, value)
+
+        # Cached on the proxy so later lookups are plain attribute reads
+        self.__dict__[attr] = value
+        return value
+
+    def loaded(self):
+        return self._module is not None
+
+    def set_wrapper(self, wrapper):
+        """
+        Pass every attribute fetched from now on through wrapper(name, value).
+        """
+        for attr in [a for a in self.__dict__ if not a.startswith('_')]:
+            del self.__dict__[attr]
+        self.__dict__['_wrapper'] = wrapper
+
+GL = LazyModule('OpenGL.GL')
+glfw = LazyModule('glfw')
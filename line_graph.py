@@ -1,173 +1,70 @@
-import glfw
-from OpenGL.GL import *
-
-def bresenham_line(x1, y1, x2, y2):
-    points = []
-    
-    dx = abs(x2 - x1)
-    dy = abs(y2 - y1)
-    
-    x_step = 1 if x2 > x1 else -1
-    y_step = 1 if y2 > y1 else -1
-    
-    x, y = x1, y1
-    
-    if dx > dy:
-        p = 2 * dy - dx
-        for _ in range(dx + 1):
-            points.append((x, y))
-            if p >= 0:
-                y += y_step
-                p += 2 * (dy - dx)
-            else:
-                p += 2 * dy
-            x += x_step
-    else:
-        p = 2 * dx - dy
-        for _ in range(dy + 1):
-            points.append((x, y))
-            if p >= 0:
-                x += x_step
-                p += 2 * (dx - dy)
-            else:
-                p += 2 * dx
-            y += y_step
-    
-    return points
-
-def dda_line(x1, y1, x2, y2):
-    points = []
-    
-    dx = x2 - x1
-    dy = y2 - y1
-    
-    steps = max(abs(dx), abs(dy))
-    
-    if steps == 0:
-        return [(x1, y1)]
-    
-    x_inc = dx / steps
-    y_inc = dy / steps
-    
-    x, y = x1, y1
-    
-    for _ in range(int(steps) + 1):
-        points.append((round(x), round(y)))
-        x += x_inc
-        y += y_inc
-    
-    return points
-
-def normalize_data(data, width, height, margin=50):
-    """
-    Normalize data to fit within the window dimensions.
-    
-    Parameters:
-    data: List of (x, y) tuples representing the dataset
-    width, height: Window dimensions
-    margin: Margin from window edges
-    
-    Returns: Normalized data points as pixel coordinates
-    """
-    if not data:
-        return []
-    
-    # Find min and max values
-    x_values = [point[0] for point in data]
-    y_values = [point[1] for point in data]
-    
-    x_min, x_max = min(x_values), max(x_values)
-    y_min, y_max = min(y_values), max(y_values)
-    
-    # Avoid division by zero
-    x_range = x_max - x_min if x_max != x_min else 1
-    y_range = y_max - y_min if y_max != y_min else 1
-    
-    # Available drawing area
-    draw_width = width - 2 * margin
-    draw_height = height - 2 * margin
-    
-    # Normalize to pixel coordinates
-    normalized = []
-    for x, y in data:
-        # Map x from [x_min, x_max] to [margin, width-margin]
-        pixel_x = margin + ((x - x_min) / x_range) * draw_width
-        # Map y from [y_min, y_max] to [height-margin, margin] (inverted for screen coords)
-        pixel_y = height - margin - ((y - y_min) / y_range) * draw_height
-        normalized.append((int(pixel_x), int(pixel_y)))
-    
-    return normalized, (x_min, x_max, y_min, y_max)
-
-def generate_graph_lines(data_points, algorithm='bresenham'):
-    all_points = []
-    
-    line_func = bresenham_line if algorithm == 'bresenham' else dda_line
-    
-    for i in range(len(data_points) - 1):
-        x1, y1 = data_points[i]
-        x2, y2 = data_points[i + 1]
-        
-        line_points = line_func(x1, y1, x2, y2)
-        all_points.extend(line_points)
-    
-    return all_points
+from lazy_gl import GL, glfw
+from raster.graph import normalize_data, decimate_points, generate_graph_lines, dedup_points
+from raster.hit import PointHitTester
+from point_renderer import PointRenderer
+from render_loop import run
+from hover import HoverTracker, show_tooltip
+import instrumentation
 
 def draw_points(points, color=(1.0, 1.0, 1.0)):
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+    GL.glColor3f(*color)
+    GL.glBegin(GL.GL_POINTS)
     for x, y in points:
-        glVertex2f(x, y)
-    glEnd()
+        GL.glVertex2f(x, y)
+    GL.glEnd()
 
 def draw_axes(width, height, margin=50):
-    glColor3f(0.5, 0.5, 0.5)
-    glLineWidth(1.0)
+    GL.glColor3f(0.5, 0.5, 0.5)
+    GL.glLineWidth(1.0)
     
-    glBegin(GL_LINES)
+    GL.glBegin(GL.GL_LINES)
     # X-axis
-    glVertex2f(margin, height - margin)
-    glVertex2f(width - margin, height - margin)
+    GL.glVertex2f(margin, height - margin)
+    GL.glVertex2f(width - margin, height - margin)
     
     # Y-axis
-    glVertex2f(margin, margin)
-    glVertex2f(margin, height - margin)
-    glEnd()
+    GL.glVertex2f(margin, margin)
+    GL.glVertex2f(margin, height - margin)
+    GL.glEnd()
 
 def draw_data_points_markers(points, color=(1.0, 0.0, 0.0)):
-    glColor3f(*color)
-    glPointSize(8.0)
-    glBegin(GL_POINTS)
+    GL.glColor3f(*color)
+    GL.glPointSize(8.0)
+    GL.glBegin(GL.GL_POINTS)
     for x, y in points:
-        glVertex2f(x, y)
-    glEnd()
+        GL.glVertex2f(x, y)
+    GL.glEnd()
 
 def draw_grid(width, height, margin, divisions=10):
-    glColor3f(0.2, 0.2, 0.2)
-    glLineWidth(1.0)
+    GL.glColor3f(0.2, 0.2, 0.2)
+    GL.glLineWidth(1.0)
     
     draw_width = width - 2 * margin
     draw_height = height - 2 * margin
     
-    glBegin(GL_LINES)
+    GL.glBegin(GL.GL_LINES)
     # Vertical grid lines
     for i in range(divisions + 1):
         x = margin + (draw_width / divisions) * i
-        glVertex2f(x, margin)
-        glVertex2f(x, height - margin)
+        GL.glVertex2f(x, margin)
+        GL.glVertex2f(x, height - margin)
     
     # Horizontal grid lines
     for i in range(divisions + 1):
         y = margin + (draw_height / divisions) * i
-        glVertex2f(margin, y)
-        glVertex2f(width - margin, y)
-    glEnd()
+        GL.glVertex2f(margin, y)
+        GL.glVertex2f(width - margin, y)
+    GL.glEnd()
 
 def main():
+    instrumentation.install(globals())
+    
     if not glfw.init():
         return
     
     width, height = 1000, 700
-    window = glfw.create_window(width, height, "Line Graph - DDA/Bresenham Algorithm", None, None)
+    title = "Line Graph - DDA/Bresenham Algorithm"
+    window = glfw.create_window(width, height, title, None, None)
     
     if not window:
         glfw.terminate()
@@ -175,12 +72,12 @@ def main():
     
     glfw.make_context_current(window)
     
-    glViewport(0, 0, width, height)
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    glOrtho(0, width, height, 0, -1, 1)
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
+    GL.glViewport(0, 0, width, height)
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glLoadIdentity()
+    GL.glOrtho(0, width, height, 0, -1, 1)
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glLoadIdentity()
     
     # Sample datasets to visualize
     datasets = [
@@ -207,29 +104,57 @@ def main():
     # Normalize data to window coordinates
     normalized_points, bounds = normalize_data(dataset['data'], width, height, margin)
     
+    # Keep at most a few vertices per pixel column before rasterizing
+    graph_vertices = decimate_points(normalized_points)
+    
     # Generate line graph using specified algorithm
-    graph_points = generate_graph_lines(normalized_points, dataset['algorithm'])
+    graph_points = generate_graph_lines(graph_vertices, dataset['algorithm'])
+    
+    # Shared segment endpoints and overlapping runs are only drawn once
+    graph_points = dedup_points(graph_points, width, height)
     
     for i, (x, y) in enumerate(dataset['data'], 1):
         print(f"  Point {i}: ({x}, {y})")
     
-    glPointSize(2.0)
+    GL.glPointSize(2.0)
+    
+    renderer = PointRenderer()
+    renderer.add(graph_points, dataset['color'])
+    
+    # Hovering shows the sample nearest the cursor, or the one in the
+    # cursor's column anywhere inside the plot area
+    hit_tester = PointHitTester(normalized_points)
+    
+    def find_sample(x, y):
+        index = hit_tester.nearest(x, y, max_distance=8)
+        if index is None and margin <= x <= width - margin and margin <= y <= height - margin:
+            index = hit_tester.nearest_x(x)
+        return index
     
-    while not glfw.window_should_close(window):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glClearColor(0.05, 0.05, 0.1, 1.0)
+    def show_sample(i):
+        if i is None:
+            show_tooltip(window, title)
+            return
+        x, y = dataset['data'][i]
+        show_tooltip(window, title, f"{dataset['name']} point {i + 1}: ({x}, {y})")
+    
+    HoverTracker(window, width, height, find_sample, show_sample)
+    
+    def draw_scene():
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        GL.glClearColor(0.05, 0.05, 0.1, 1.0)
         
         draw_grid(width, height, margin, divisions=10)
         
         draw_axes(width, height, margin)
         
-        draw_points(graph_points, dataset['color'])
+        renderer.draw()
         
         draw_data_points_markers(normalized_points, (1.0, 0.0, 0.0))
-        
-        glfw.swap_buffers(window)
-        glfw.poll_events()
     
+    run(window, draw_scene)
+    
+    renderer.delete()
     glfw.terminate()
 
 if __name__ == "__main__":
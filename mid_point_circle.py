@@ -1,70 +1,47 @@
-import glfw
-from OpenGL.GL import *
-
-def plot_circle_points(xc, yc, x, y, points):
-    points.extend([
-        (xc + x, yc + y),  # Octant 1
-        (xc - x, yc + y),  # Octant 4
-        (xc + x, yc - y),  # Octant 8
-        (xc - x, yc - y),  # Octant 5
-        (xc + y, yc + x),  # Octant 2
-        (xc - y, yc + x),  # Octant 3
-        (xc + y, yc - x),  # Octant 7
-        (xc - y, yc - x),  # Octant 6
-    ])
-
-def midpoint_circle(xc, yc, r):
-    points = []
-    
-    x = 0
-    y = r
-    
-    p = 1 - r
-    
-    plot_circle_points(xc, yc, x, y, points)
-    
-    # Iterate until x >= y
-    while x < y:
-        x += 1
-        
-        if p < 0:
-            # Mid-point is inside the circle
-            p += 2 * x + 1
-        else:
-            # Mid-point is outside the circle
-            y -= 1
-            p += 2 * (x - y) + 1
-        
-        # Plot points in all 8 octants
-        plot_circle_points(xc, yc, x, y, points)
-    
-    return points
+from lazy_gl import GL, glfw
+import numpy as np
+from raster.circle import midpoint_circles, midpoint_circle_spans
+from point_renderer import PointRenderer
+from render_loop import run
+import instrumentation
 
 def draw_points(points, color=(1.0, 1.0, 1.0)):
-    glColor3f(*color)
-    glBegin(GL_POINTS)
+    GL.glColor3f(*color)
+    GL.glBegin(GL.GL_POINTS)
     for x, y in points:
-        glVertex2f(x, y)
-    glEnd()
+        GL.glVertex2f(x, y)
+    GL.glEnd()
 
-def draw_filled_circle(xc, yc, r, color=(1.0, 1.0, 1.0)):
+def draw_spans(spans, color=(1.0, 1.0, 1.0), alpha=1.0):
     """
-    Optional: Draw a filled circle using the mid-point algorithm
-    by drawing horizontal lines between symmetric points
+    Draw (y, x_left, x_right) spans, e.g. from several circles, in one call.
     """
-    glColor4f(*color, 0.3)  # Semi-transparent fill
-    
-    x = 0
-    y = r
-    p = 1 - r
+    spans = np.asarray(spans).reshape(-1, 3)
+    if not len(spans):
+        return
     
-    glBegin(GL_LINES)
-    for i in range(-r, r + 1):
-        glVertex2f(xc - r, yc + i)
-        glVertex2f(xc + r, yc + i)
-    glEnd()
+    # Each span becomes one line through the pixel centers of its row
+    vertices = np.empty((len(spans), 2, 2), dtype=np.float32)
+    vertices[:, 0, 0] = spans[:, 1]
+    vertices[:, 1, 0] = spans[:, 2] + 1
+    vertices[:, :, 1] = spans[:, 0, None] + 0.5
+    
+    GL.glColor4f(*color, alpha)
+    GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+    GL.glVertexPointer(2, GL.GL_FLOAT, 0, vertices)
+    GL.glDrawArrays(GL.GL_LINES, 0, 2 * len(spans))
+    GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+
+def draw_filled_circle(xc, yc, r, color=(1.0, 1.0, 1.0)):
+    """
+    Draw a filled circle using the mid-point algorithm
+    by drawing one horizontal span per scanline
+    """
+    draw_spans(midpoint_circle_spans(xc, yc, r), color, 0.3)  # Semi-transparent fill
 
 def main():
+    instrumentation.install(globals())
+    
     if not glfw.init():
         return
     
@@ -77,17 +54,17 @@ def main():
     
     glfw.make_context_current(window)
     
-    glViewport(0, 0, width, height)
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    glOrtho(0, width, height, 0, -1, 1)  # 2D orthographic projection
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
+    GL.glViewport(0, 0, width, height)
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glLoadIdentity()
+    GL.glOrtho(0, width, height, 0, -1, 1)  # 2D orthographic projection
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glLoadIdentity()
     
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    GL.glEnable(GL.GL_BLEND)
+    GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
     
-    glPointSize(2.0)
+    GL.glPointSize(2.0)
     
     # Define circles to draw
     circles = [
@@ -100,24 +77,27 @@ def main():
         (400, 150, 40, (0.0, 1.0, 1.0)),    # Cyan circle (small)
     ]
     
-    # Calculate all circle points using mid-point algorithm
-    all_circle_data = []
-    for xc, yc, r, color in circles:
-        points = midpoint_circle(xc, yc, r)
-        all_circle_data.append((points, color))
-        
-        print(f"Circle at ({xc},{yc}) with radius {r}: {len(points)} points generated")
+    # Calculate all circle points using mid-point algorithm, in one batch
+    centers = [(xc, yc) for xc, yc, r, color in circles]
+    radii = [r for xc, yc, r, color in circles]
+    points, offsets = midpoint_circles(centers, radii)
     
-    while not glfw.window_should_close(window):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glClearColor(0.05, 0.05, 0.05, 1.0)
+    renderer = PointRenderer()
+    for i, (xc, yc, r, color) in enumerate(circles):
+        circle_points = points[offsets[i]:offsets[i + 1]]
+        renderer.add(circle_points, color)
         
-        for points, color in all_circle_data:
-            draw_points(points, color)
+        print(f"Circle at ({xc},{yc}) with radius {r}: {len(circle_points)} points generated")
+    
+    def draw_scene():
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        GL.glClearColor(0.05, 0.05, 0.05, 1.0)
         
-        glfw.swap_buffers(window)
-        glfw.poll_events()
+        renderer.draw()
+    
+    run(window, draw_scene)
     
+    renderer.delete()
     glfw.terminate()
 
 if __name__ == "__main__":
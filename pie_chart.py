@@ -1,130 +1,196 @@
-import glfw
-from OpenGL.GL import *
+from lazy_gl import GL, glfw
+import ctypes
 import math
+import numpy as np
+from raster.pie import arc_segments, pie_sectors, pie_triangles, layout_sectors
+from raster.hit import PieHitTester
+from render_loop import run
+from hover import HoverTracker, show_tooltip
+import instrumentation
 
-def draw_filled_circle_sector(cx, cy, radius, start_angle, end_angle, color, segments=100):
-    glColor3f(*color)
-    glBegin(GL_TRIANGLE_FAN)
+def draw_filled_circle_sector(cx, cy, radius, start_angle, end_angle, color, segments=None):
+    GL.glColor3f(*color)
+    GL.glBegin(GL.GL_TRIANGLE_FAN)
     
-    glVertex2f(cx, cy)
+    GL.glVertex2f(cx, cy)
     
     # Calculate number of segments for this sector
     angle_range = end_angle - start_angle
-    sector_segments = max(int(segments * (angle_range / (2 * math.pi))), 2)
+    if segments is None:
+        sector_segments = arc_segments(radius, angle_range)
+    else:
+        sector_segments = max(int(segments * (angle_range / (2 * math.pi))), 2)
     
     # Draw vertices along the arc
     for i in range(sector_segments + 1):
         angle = start_angle + (angle_range * i / sector_segments)
         x = cx + radius * math.cos(angle)
         y = cy + radius * math.sin(angle)
-        glVertex2f(x, y)
+        GL.glVertex2f(x, y)
     
-    glEnd()
+    GL.glEnd()
 
-def draw_circle_outline(cx, cy, radius, color=(1.0, 1.0, 1.0), segments=100):
-    glColor3f(*color)
-    glLineWidth(2.0)
-    glBegin(GL_LINE_LOOP)
+def draw_circle_outline(cx, cy, radius, color=(1.0, 1.0, 1.0), segments=None):
+    if segments is None:
+        segments = max(arc_segments(radius), 3)
+    
+    GL.glColor3f(*color)
+    GL.glLineWidth(2.0)
+    GL.glBegin(GL.GL_LINE_LOOP)
     
     for i in range(segments):
         angle = 2.0 * math.pi * i / segments
         x = cx + radius * math.cos(angle)
         y = cy + radius * math.sin(angle)
-        glVertex2f(x, y)
+        GL.glVertex2f(x, y)
     
-    glEnd()
+    GL.glEnd()
 
-def draw_sector_outline(cx, cy, radius, start_angle, end_angle, color=(1.0, 1.0, 1.0), segments=100):
-    glColor3f(*color)
-    glLineWidth(2.0)
+def draw_sector_outline(cx, cy, radius, start_angle, end_angle, color=(1.0, 1.0, 1.0), segments=None):
+    GL.glColor3f(*color)
+    GL.glLineWidth(2.0)
     
     # Draw the arc
-    glBegin(GL_LINE_STRIP)
+    GL.glBegin(GL.GL_LINE_STRIP)
     angle_range = end_angle - start_angle
-    sector_segments = max(int(segments * (angle_range / (2 * math.pi))), 2)
+    if segments is None:
+        sector_segments = arc_segments(radius, angle_range)
+    else:
+        sector_segments = max(int(segments * (angle_range / (2 * math.pi))), 2)
     
     for i in range(sector_segments + 1):
         angle = start_angle + (angle_range * i / sector_segments)
         x = cx + radius * math.cos(angle)
         y = cy + radius * math.sin(angle)
-        glVertex2f(x, y)
+        GL.glVertex2f(x, y)
     
-    glEnd()
+    GL.glEnd()
     
     # Draw radial lines
-    glBegin(GL_LINES)
+    GL.glBegin(GL.GL_LINES)
     # Start radius
-    glVertex2f(cx, cy)
-    glVertex2f(cx + radius * math.cos(start_angle), cy + radius * math.sin(start_angle))
+    GL.glVertex2f(cx, cy)
+    GL.glVertex2f(cx + radius * math.cos(start_angle), cy + radius * math.sin(start_angle))
     # End radius
-    glVertex2f(cx, cy)
-    glVertex2f(cx + radius * math.cos(end_angle), cy + radius * math.sin(end_angle))
-    glEnd()
+    GL.glVertex2f(cx, cy)
+    GL.glVertex2f(cx + radius * math.cos(end_angle), cy + radius * math.sin(end_angle))
+    GL.glEnd()
 
-def create_pie_chart(data, labels, colors, cx, cy, radius):
-    total = sum(data)
-    sectors = []
+def draw_pie_chart(sectors, cx, cy, radius):
+    if not sectors or 'geometry' not in sectors[0]:
+        for sector in sectors:
+            draw_filled_circle_sector(
+                cx, cy, radius,
+                sector['start_angle'],
+                sector['end_angle'],
+                sector['color']
+            )
+            
+            # Draw outline for each sector
+            draw_sector_outline(
+                cx, cy, radius,
+                sector['start_angle'],
+                sector['end_angle'],
+                (0.2, 0.2, 0.2)
+            )
+        return
     
-    current_angle = -math.pi / 2  # Start at top (12 o'clock position)
+    # All sectors share the vertex array built by create_pie_chart
+    GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+    GL.glVertexPointer(2, GL.GL_FLOAT, 0, sectors[0]['geometry'][0])
+    GL.glLineWidth(2.0)
     
-    for i, (value, label, color) in enumerate(zip(data, labels, colors)):
-        percentage = (value / total) * 100
-        angle_size = (value / total) * 2 * math.pi
+    for sector in sectors:
+        _, first, count = sector['geometry']
         
-        sector_info = {
-            'value': value,
-            'percentage': percentage,
-            'label': label,
-            'color': color,
-            'start_angle': current_angle,
-            'end_angle': current_angle + angle_size,
-            'mid_angle': current_angle + angle_size / 2
-        }
+        GL.glColor3f(*sector['color'])
+        GL.glDrawArrays(GL.GL_TRIANGLE_FAN, first, count)
         
-        sectors.append(sector_info)
-        current_angle += angle_size
+        # Outline: center -> arc -> center over the same vertices
+        GL.glColor3f(0.2, 0.2, 0.2)
+        GL.glDrawArrays(GL.GL_LINE_LOOP, first, count)
     
-    return sectors
+    GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
 
-def draw_pie_chart(sectors, cx, cy, radius):
-    for sector in sectors:
-        draw_filled_circle_sector(
-            cx, cy, radius,
-            sector['start_angle'],
-            sector['end_angle'],
-            sector['color']
-        )
-        
-        # Draw outline for each sector
-        draw_sector_outline(
-            cx, cy, radius,
-            sector['start_angle'],
-            sector['end_angle'],
-            (0.2, 0.2, 0.2)
-        )
+class PieRenderer:
+    """
+    Retained-mode renderer for pie_triangles output.
+
+    The interleaved (x, y, r, g, b) vertices of the whole chart live in one
+    vertex buffer, so fills and outlines of any number of sectors are drawn
+    with a single glDrawArrays call.
+    """
+
+    STRIDE = 5 * 4  # Bytes per float32 (x, y, r, g, b) vertex
+
+    def __init__(self, vertices=None):
+        self.vertex_count = 0
+        self._vertices = None
+        self._vbo = None
+        if vertices is not None:
+            self.set(vertices)
+
+    def set(self, vertices):
+        self._vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 5)
+        self.vertex_count = len(self._vertices)
+
+    def upload(self):
+        if self._vbo is None:
+            self._vbo = GL.glGenBuffers(1)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, self._vertices.nbytes, self._vertices, GL.GL_STATIC_DRAW)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+        # The buffer owns the data now
+        self._vertices = None
+
+    def draw(self):
+        if self._vertices is not None:
+            self.upload()
+
+        if not self.vertex_count:
+            return
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glEnableClientState(GL.GL_COLOR_ARRAY)
+        GL.glVertexPointer(2, GL.GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+        GL.glColorPointer(3, GL.GL_FLOAT, self.STRIDE, ctypes.c_void_p(8))
+
+        GL.glDrawArrays(GL.GL_TRIANGLES, 0, self.vertex_count)
+
+        GL.glDisableClientState(GL.GL_COLOR_ARRAY)
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        if self._vbo is not None:
+            GL.glDeleteBuffers(1, [self._vbo])
+            self._vbo = None
 
 def draw_legend(sectors, x, y, box_size=20, spacing=30):
     for i, sector in enumerate(sectors):
         y_pos = y + i * spacing
         
         # Draw colored box
-        glColor3f(*sector['color'])
-        glBegin(GL_QUADS)
-        glVertex2f(x, y_pos)
-        glVertex2f(x + box_size, y_pos)
-        glVertex2f(x + box_size, y_pos + box_size)
-        glVertex2f(x, y_pos + box_size)
-        glEnd()
+        GL.glColor3f(*sector['color'])
+        GL.glBegin(GL.GL_QUADS)
+        GL.glVertex2f(x, y_pos)
+        GL.glVertex2f(x + box_size, y_pos)
+        GL.glVertex2f(x + box_size, y_pos + box_size)
+        GL.glVertex2f(x, y_pos + box_size)
+        GL.glEnd()
         
         # Draw box outline
-        glColor3f(1.0, 1.0, 1.0)
-        glLineWidth(1.0)
-        glBegin(GL_LINE_LOOP)
-        glVertex2f(x, y_pos)
-        glVertex2f(x + box_size, y_pos)
-        glVertex2f(x + box_size, y_pos + box_size)
-        glVertex2f(x, y_pos + box_size)
-        glEnd()
+        GL.glColor3f(1.0, 1.0, 1.0)
+        GL.glLineWidth(1.0)
+        GL.glBegin(GL.GL_LINE_LOOP)
+        GL.glVertex2f(x, y_pos)
+        GL.glVertex2f(x + box_size, y_pos)
+        GL.glVertex2f(x + box_size, y_pos + box_size)
+        GL.glVertex2f(x, y_pos + box_size)
+        GL.glEnd()
 
 def draw_labels_on_chart(sectors, cx, cy, radius):
     for sector in sectors:
@@ -136,18 +202,21 @@ def draw_labels_on_chart(sectors, cx, cy, radius):
         label_y = cy + label_radius * math.sin(mid_angle)
         
         # Draw a small circle at label position to show percentage location
-        glColor3f(1.0, 1.0, 1.0)
-        glPointSize(8.0)
-        glBegin(GL_POINTS)
-        glVertex2f(label_x, label_y)
-        glEnd()
+        GL.glColor3f(1.0, 1.0, 1.0)
+        GL.glPointSize(8.0)
+        GL.glBegin(GL.GL_POINTS)
+        GL.glVertex2f(label_x, label_y)
+        GL.glEnd()
 
 def main():
+    instrumentation.install(globals())
+    
     if not glfw.init():
         return
     
     width, height = 1000, 700
-    window = glfw.create_window(width, height, "Pie Chart - OpenGL Implementation", None, None)
+    title = "Pie Chart - OpenGL Implementation"
+    window = glfw.create_window(width, height, title, None, None)
     
     if not window:
         glfw.terminate()
@@ -155,17 +224,17 @@ def main():
     
     glfw.make_context_current(window)
     
-    glViewport(0, 0, width, height)
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    glOrtho(0, width, height, 0, -1, 1)
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
+    GL.glViewport(0, 0, width, height)
+    GL.glMatrixMode(GL.GL_PROJECTION)
+    GL.glLoadIdentity()
+    GL.glOrtho(0, width, height, 0, -1, 1)
+    GL.glMatrixMode(GL.GL_MODELVIEW)
+    GL.glLoadIdentity()
     
-    glEnable(GL_LINE_SMOOTH)
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-    glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
+    GL.glEnable(GL.GL_LINE_SMOOTH)
+    GL.glEnable(GL.GL_BLEND)
+    GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
+    GL.glHint(GL.GL_LINE_SMOOTH_HINT, GL.GL_NICEST)
     
     data = [30, 45, 15, 60, 25]
     labels = ['Product A', 'Product B', 'Product C', 'Product D', 'Product E']
@@ -181,7 +250,25 @@ def main():
     center_y = height // 2
     radius = 200
     
-    sectors = create_pie_chart(data, labels, colors, center_x, center_y, radius)
+    # Sectors thinner than a pixel at the rim are merged into "other", and
+    # the whole chart is drawn from one buffer
+    layout = pie_sectors(data, radius)
+    pie_renderer = PieRenderer(pie_triangles(layout, center_x, center_y, radius, colors))
+    
+    # Labels and legend follow the drawn (merged) sectors
+    sectors = layout_sectors(layout, labels, colors)
+    
+    # Hovering a sector shows its value in the title bar
+    hit_tester = PieHitTester(layout, center_x, center_y, radius)
+    
+    def show_sector(i):
+        if i is None:
+            show_tooltip(window, title)
+            return
+        sector = sectors[i]
+        show_tooltip(window, title, f"{sector['label']}: {sector['value']:g} ({sector['percentage']:.1f}%)")
+    
+    HoverTracker(window, width, height, hit_tester.hit, show_sector)
     
     print("Pie Chart Data:")
     print("-" * 60)
@@ -194,26 +281,26 @@ def main():
     for sector in sectors:
         print(f"{sector['label']:12s}: RGB{sector['color']}")
     
-    while not glfw.window_should_close(window):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glClearColor(0.1, 0.1, 0.15, 1.0)
+    def draw_scene():
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+        GL.glClearColor(0.1, 0.1, 0.15, 1.0)
         
-        draw_pie_chart(sectors, center_x, center_y, radius)
+        pie_renderer.draw()
         
         draw_labels_on_chart(sectors, center_x, center_y, radius)
         
         draw_legend(sectors, width - 250, 100)
         
-        glColor3f(0.7, 0.7, 0.7)
-        glLineWidth(2.0)
-        glBegin(GL_LINES)
-        glVertex2f(width // 2 - 100, 30)
-        glVertex2f(width // 2 + 100, 30)
-        glEnd()
-        
-        glfw.swap_buffers(window)
-        glfw.poll_events()
+        GL.glColor3f(0.7, 0.7, 0.7)
+        GL.glLineWidth(2.0)
+        GL.glBegin(GL.GL_LINES)
+        GL.glVertex2f(width // 2 - 100, 30)
+        GL.glVertex2f(width // 2 + 100, 30)
+        GL.glEnd()
+    
+    run(window, draw_scene)
     
+    pie_renderer.delete()
     glfw.terminate()
 
 if __name__ == "__main__":
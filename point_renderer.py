@@ -0,0 +1,111 @@
+from lazy_gl import GL
+import numpy as np
+from raster.point_buffer import point_view
+import instrumentation
+
+# Vertex component types accepted by glVertexPointer, looked up by name so
+# OpenGL is only imported once a renderer is created
+GL_TYPES = {
+    np.dtype(np.int16): 'GL_SHORT',
+    np.dtype(np.int32): 'GL_INT',
+    np.dtype(np.float32): 'GL_FLOAT',
+}
+
+class PointRenderer:
+    """
+    Retained-mode renderer for precomputed pixel lists.
+
+    Point lists are added once, packed into a single vertex buffer and then
+    drawn every frame with one glDrawArrays call per primitive instead of
+    one glVertex2f call per pixel.
+
+    Vertices are stored as int16, int32 (default) or float32 pairs. Point
+    buffers of the same type (see point_buffer) are uploaded straight from
+    their memory without an intermediate copy.
+    """
+
+    def __init__(self, dtype=np.int32):
+        self.dtype = np.dtype(dtype)
+        self.gl_type = getattr(GL, GL_TYPES[self.dtype])
+        self.ranges = []  # (color, first, count) per primitive
+        self.vertex_count = 0
+        self._chunks = []
+        self._vbo = None
+        self._dirty = False
+
+    def add(self, points, color=(1.0, 1.0, 1.0), count=None):
+        """
+        Queue points for upload and return their (first, count) range.
+
+        points: List of (x, y) tuples, an N x 2 array, or an interleaved
+                point buffer of which only the first count points are used
+        """
+        if isinstance(points, (list, tuple)):
+            points = np.asarray(points, dtype=self.dtype).reshape(-1, 2)
+        else:
+            # Zero-copy when the buffer already has the renderer's type
+            points = np.asarray(point_view(points), dtype=self.dtype)
+        if count is not None:
+            points = points[:count]
+
+        first = self.vertex_count
+        self._chunks.append(points)
+        self.ranges.append((color, first, len(points)))
+        self.vertex_count += len(points)
+        self._dirty = True
+
+        return first, len(points)
+
+    def clear(self):
+        self.ranges = []
+        self.vertex_count = 0
+        self._chunks = []
+        self._dirty = True
+
+    def upload(self):
+        if self._vbo is None:
+            self._vbo = GL.glGenBuffers(1)
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
+
+        if len(self._chunks) == 1:
+            data = np.ascontiguousarray(self._chunks[0])
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, data.nbytes, data, GL.GL_STATIC_DRAW)
+        else:
+            # Allocate once and copy each chunk straight from its own memory
+            item_size = 2 * self.dtype.itemsize
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, self.vertex_count * item_size, None, GL.GL_STATIC_DRAW)
+            offset = 0
+            for chunk in self._chunks:
+                chunk = np.ascontiguousarray(chunk)
+                if len(chunk):
+                    GL.glBufferSubData(GL.GL_ARRAY_BUFFER, offset, chunk.nbytes, chunk)
+                offset += len(chunk) * item_size
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        self._dirty = False
+
+    def draw(self):
+        if self._dirty:
+            self.upload()
+
+        if not self.vertex_count:
+            return
+
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glVertexPointer(2, self.gl_type, 0, None)
+
+        for color, first, count in self.ranges:
+            GL.glColor3f(*color)
+            GL.glDrawArrays(GL.GL_POINTS, first, count)
+
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        if self._vbo is not None:
+            GL.glDeleteBuffers(1, [self._vbo])
+            self._vbo = None
+
+instrumentation.install(globals())
@@ -0,0 +1,31 @@
+"""
+Pure rasterization algorithms shared by the OpenGL demos.
+
+Nothing in this package imports OpenGL or GLFW, so it can be used from
+headless batch jobs (framebuffer rendering, tiling, benchmarks) without a
+display or GL driver.
+"""
+from .lines import (
+    dda_line, dda_lines, dda_arrays,
+    bresenham_line, bresenham_arrays, bresenham_runs, clip_steps
+)
+from .circle import (
+    midpoint_circle, midpoint_circle_cached, midpoint_circles, midpoint_circle_spans,
+    midpoint_circle_contour, contour_from_quadrant, unique_in_order,
+    CircleOffsetCache, circle_offset_cache
+)
+from .ellipse import midpoint_ellipse, ellipse_quadrant, midpoint_ellipse_contour, midpoint_ellipse_int
+from .graph import (
+    load_samples, data_bounds, normalize_data, decimate_minmax, decimate_lttb,
+    decimate_points, generate_graph_lines, IncrementalGraph,
+    occupancy_bitmap, dedup_points
+)
+from .pie import (
+    ARC_MAX_ERROR, arc_segments, angle_table, pie_geometry, pie_pixels,
+    pie_sectors, pie_triangles, layout_sectors, create_pie_chart
+)
+from .point_buffer import (
+    point_buffer, point_view, write_points,
+    line_capacity, circle_capacity, ellipse_capacity
+)
+from .hit import PieHitTester, PointHitTester
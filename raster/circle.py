@@ -0,0 +1,246 @@
+import numpy as np
+from collections import OrderedDict
+from .point_buffer import write_points
+
+def plot_circle_points(xc, yc, x, y, points):
+    points.extend([
+        (xc + x, yc + y),  # Octant 1
+        (xc - x, yc + y),  # Octant 4
+        (xc + x, yc - y),  # Octant 8
+        (xc - x, yc - y),  # Octant 5
+        (xc + y, yc + x),  # Octant 2
+        (xc - y, yc + x),  # Octant 3
+        (xc + y, yc - x),  # Octant 7
+        (xc - y, yc - x),  # Octant 6
+    ])
+
+def midpoint_circle(xc, yc, r, out=None, start=0):
+    """
+    Mid-point circle of radius r centered at (xc, yc).
+    
+    out: Optional interleaved int16/int32 point buffer (see point_buffer).
+    The pixels are written into it from point index start by translating the
+    cached offsets for r, and the index one past the last written point is
+    returned.
+    """
+    if out is not None:
+        offsets = circle_offset_cache.get(r)
+        return write_points(out, start, offsets[:, 0] + xc, offsets[:, 1] + yc)
+    
+    points = []
+    
+    x = 0
+    y = r
+    
+    p = 1 - r
+    
+    plot_circle_points(xc, yc, x, y, points)
+    
+    # Iterate until x >= y
+    while x < y:
+        x += 1
+        
+        if p < 0:
+            # Mid-point is inside the circle
+            p += 2 * x + 1
+        else:
+            # Mid-point is outside the circle
+            y -= 1
+            p += 2 * (x - y) + 1
+        
+        # Plot points in all 8 octants
+        plot_circle_points(xc, yc, x, y, points)
+    
+    return points
+
+class CircleOffsetCache:
+    """
+    LRU cache of midpoint circle pixels relative to the center, keyed by radius.
+    
+    The pixel pattern of midpoint_circle depends only on r, so circles that
+    share a radius reuse one offset array and only pay for a translate.
+    """
+    
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._offsets = OrderedDict()
+    
+    def get(self, r):
+        offsets = self._offsets.get(r)
+        if offsets is not None:
+            self._offsets.move_to_end(r)
+            self.hits += 1
+            return offsets
+        
+        self.misses += 1
+        offsets = np.array(midpoint_circle(0, 0, r), dtype=np.int32).reshape(-1, 2)
+        offsets.setflags(write=False)  # Shared between callers
+        
+        self._offsets[r] = offsets
+        while len(self._offsets) > self.maxsize:
+            self._offsets.popitem(last=False)
+            self.evictions += 1
+        
+        return offsets
+    
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._offsets),
+            'maxsize': self.maxsize
+        }
+    
+    def clear(self):
+        self._offsets.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+circle_offset_cache = CircleOffsetCache()
+
+def midpoint_circle_cached(xc, yc, r, cache=None):
+    """
+    Same pixels as midpoint_circle, as an N x 2 int32 array, built by
+    translating the cached offsets for radius r.
+    """
+    if cache is None:
+        cache = circle_offset_cache
+    
+    return cache.get(r) + np.array((xc, yc), dtype=np.int32)
+
+def unique_in_order(points):
+    """
+    Rows of an N x 2 array with repeats removed, keeping first occurrences
+    in their original order.
+    """
+    if not len(points):
+        return points
+    _, first = np.unique(points, axis=0, return_index=True)
+    return points[np.sort(first)]
+
+def contour_from_quadrant(xc, yc, quadrant):
+    """
+    Mirror first-quadrant offsets into one closed contour.
+    
+    Parameters:
+    quadrant: K x 2 offsets ordered along the curve from (0, ry) to (rx, 0)
+    
+    Returns: N x 2 int32 array of pixels in order around the curve, starting
+    at (xc, yc + ry) and passing through (xc + rx, yc), (xc, yc - ry) and
+    (xc - rx, yc), with every pixel listed once. Consecutive pixels are
+    8-connected, so it can be drawn as a strip or GL_LINE_LOOP.
+    """
+    quadrant = np.asarray(quadrant, dtype=np.int32).reshape(-1, 2)
+    reverse = quadrant[::-1]
+    
+    contour = np.concatenate((
+        quadrant,
+        reverse * np.array([1, -1], dtype=np.int32),
+        quadrant * np.array([-1, -1], dtype=np.int32),
+        reverse * np.array([-1, 1], dtype=np.int32),
+    ))
+    
+    # Axis pixels are shared by neighbouring quadrants (and everything
+    # collapses onto an axis when a radius is 0)
+    return unique_in_order(contour) + np.array((xc, yc), dtype=np.int32)
+
+def midpoint_circle_contour(xc, yc, r, cache=None):
+    """
+    Same pixel set as midpoint_circle, without the repeated pixels on the
+    axes and diagonals, in order around the circle (see contour_from_quadrant).
+    """
+    if cache is None:
+        cache = circle_offset_cache
+    
+    # Every 8th cached offset is the first octant, from (0, r) to the diagonal;
+    # swapping it and walking it backwards continues the arc to (r, 0)
+    octant = cache.get(r)[0::8]
+    quadrant = unique_in_order(np.concatenate((octant, octant[::-1, ::-1])))
+    
+    return contour_from_quadrant(xc, yc, quadrant)
+
+def midpoint_circles(centers, radii, cache=None):
+    """
+    Rasterize many circles at once, pixel-identical to midpoint_circle.
+    
+    Circles are grouped by radius. Each radius' pixel pattern is generated
+    once (through the offset cache) and broadcast over the centers of every
+    circle in its group.
+    
+    Parameters:
+    centers: N x 2 array of (xc, yc) rows
+    radii: N integer radii
+    cache: CircleOffsetCache to take the patterns from, circle_offset_cache
+           when None
+    
+    Returns: (points, offsets) where points is an M x 2 int32 array and the
+    pixels of circle i are points[offsets[i]:offsets[i + 1]]
+    """
+    if cache is None:
+        cache = circle_offset_cache
+    
+    centers = np.asarray(centers, dtype=np.int32).reshape(-1, 2)
+    radii = np.asarray(radii, dtype=np.int64).reshape(-1)
+    if len(centers) != len(radii):
+        raise ValueError(f"got {len(centers)} centers but {len(radii)} radii")
+    
+    unique_radii, group = np.unique(radii, return_inverse=True)
+    patterns = [cache.get(int(r)) for r in unique_radii]
+    
+    offsets = np.zeros(len(radii) + 1, dtype=np.int64)
+    counts = np.array([len(pattern) for pattern in patterns], dtype=np.int64)
+    np.cumsum(counts[group], out=offsets[1:])
+    
+    points = np.empty((offsets[-1], 2), dtype=np.int32)
+    
+    # Circle indices sorted by radius, split into one block per radius
+    order = np.argsort(group, kind='stable')
+    groups = np.split(order, np.cumsum(np.bincount(group, minlength=len(patterns)))[:-1])
+    
+    for members, pattern in zip(groups, patterns):
+        # Row j of the group's block is the pattern translated to center j
+        rows = offsets[members, None] + np.arange(len(pattern))
+        points[rows] = centers[members, None, :] + pattern
+    
+    return points, offsets
+
+def midpoint_circle_spans(xc, yc, r):
+    """
+    Scanline spans of a filled circle from the mid-point decision loop.
+    
+    Returns: (2r + 1) x 3 int32 array of (y, x_left, x_right) rows, one per
+    scanline from yc - r to yc + r, with both ends inclusive and lying on
+    the circle outline produced by midpoint_circle.
+    """
+    # Widest outline x seen for each vertical distance from the center
+    half_widths = np.zeros(r + 1, dtype=np.int32)
+    
+    x = 0
+    y = r
+    p = 1 - r
+    
+    half_widths[y] = max(half_widths[y], x)
+    half_widths[x] = max(half_widths[x], y)
+    
+    while x < y:
+        x += 1
+        
+        if p < 0:
+            p += 2 * x + 1
+        else:
+            y -= 1
+            p += 2 * (x - y) + 1
+        
+        # Octants 1/4/5/8 bound rows yc +- y, octants 2/3/6/7 rows yc +- x
+        half_widths[y] = max(half_widths[y], x)
+        half_widths[x] = max(half_widths[x], y)
+    
+    dy = np.arange(-r, r + 1)
+    hw = half_widths[np.abs(dy)]
+    
+    return np.column_stack((yc + dy, xc - hw, xc + hw)).astype(np.int32)
@@ -0,0 +1,214 @@
+from array import array
+import numpy as np
+from .point_buffer import point_view
+from .circle import contour_from_quadrant
+
+def plot_ellipse_points(xc, yc, x, y, points):
+    points.extend([
+        (xc + x, yc + y),  # Quadrant 1
+        (xc - x, yc + y),  # Quadrant 2
+        (xc - x, yc - y),  # Quadrant 3
+        (xc + x, yc - y),  # Quadrant 4
+    ])
+
+def mirror_quadrant(xc, yc, quadrant_x, quadrant_y, out, start):
+    """
+    Write the four mirrored copies of first-quadrant offsets into out, in
+    the same order as plot_ellipse_points.
+    """
+    x = np.frombuffer(quadrant_x, dtype=np.dtype(quadrant_x.typecode)) if len(quadrant_x) else np.zeros(0, np.int64)
+    y = np.frombuffer(quadrant_y, dtype=np.dtype(quadrant_y.typecode)) if len(quadrant_y) else np.zeros(0, np.int64)
+    
+    view = point_view(out)
+    end = start + 4 * len(x)
+    if end > len(view):
+        raise ValueError(f"point buffer too small: need {end} points, have {len(view)}")
+    
+    # Quadrants 1, 2, 3, 4 interleaved per step
+    block = view[start:end].reshape(-1, 4, 2)
+    block[:, :, 0] = xc + x[:, None] * np.array([1, -1, -1, 1])
+    block[:, :, 1] = yc + y[:, None] * np.array([1, 1, -1, -1])
+    
+    return end
+
+def ellipse_quadrant(rx, ry):
+    """
+    First-quadrant offsets of the mid-point ellipse, in plotting order from
+    (0, ry) to (rx, 0), as flat integer arrays (quadrant_x, quadrant_y).
+    """
+    quadrant_x = array('l')
+    quadrant_y = array('l')
+    
+    x = 0
+    y = ry
+    
+    rx_sq = rx * rx
+    ry_sq = ry * ry
+    two_rx_sq = 2 * rx_sq
+    two_ry_sq = 2 * ry_sq
+    
+    p1 = ry_sq - (rx_sq * ry) + (0.25 * rx_sq)
+    
+    dx = two_ry_sq * x
+    dy = two_rx_sq * y
+    
+    # Same decisions as midpoint_ellipse, recording offsets instead of points
+    while dx < dy:
+        quadrant_x.append(x)
+        quadrant_y.append(y)
+        
+        x += 1
+        dx += two_ry_sq
+        
+        if p1 < 0:
+            p1 += dx + ry_sq
+        else:
+            y -= 1
+            dy -= two_rx_sq
+            p1 += dx - dy + ry_sq
+    
+    p2 = ry_sq * (x + 0.5) * (x + 0.5) + rx_sq * (y - 1) * (y - 1) - rx_sq * ry_sq
+    
+    while y >= 0:
+        quadrant_x.append(x)
+        quadrant_y.append(y)
+        
+        y -= 1
+        dy -= two_rx_sq
+        
+        if p2 > 0:
+            p2 += rx_sq - dy
+        else:
+            x += 1
+            dx += two_ry_sq
+            p2 += dx - dy + rx_sq
+    
+    return quadrant_x, quadrant_y
+
+def midpoint_ellipse(xc, yc, rx, ry, out=None, start=0):
+    """
+    Mid-point ellipse with radii rx, ry centered at (xc, yc).
+    
+    out: Optional interleaved int16/int32 point buffer (see point_buffer).
+    Only the first-quadrant steps are recorded (see ellipse_quadrant) and
+    mirrored into the buffer from point index start in one vectorized write;
+    the index one past the last written point is returned.
+    """
+    if out is not None:
+        quadrant_x, quadrant_y = ellipse_quadrant(rx, ry)
+        return mirror_quadrant(xc, yc, quadrant_x, quadrant_y, out, start)
+    
+    points = []
+    
+    # Region 1: Slope < -1
+    x = 0
+    y = ry
+    
+    # Initial decision parameters
+    rx_sq = rx * rx
+    ry_sq = ry * ry
+    two_rx_sq = 2 * rx_sq
+    two_ry_sq = 2 * ry_sq
+    
+    # Region 1 decision parameter
+    p1 = ry_sq - (rx_sq * ry) + (0.25 * rx_sq)
+    
+    dx = two_ry_sq * x
+    dy = two_rx_sq * y
+    
+    # Region 1: Continue while slope < -1
+    while dx < dy:
+        plot_ellipse_points(xc, yc, x, y, points)
+        
+        x += 1
+        dx += two_ry_sq
+        
+        if p1 < 0:
+            p1 += dx + ry_sq
+        else:
+            y -= 1
+            dy -= two_rx_sq
+            p1 += dx - dy + ry_sq
+    
+    # Region 2: Slope >= -1
+    # Recalculate decision parameter for region 2
+    p2 = ry_sq * (x + 0.5) * (x + 0.5) + rx_sq * (y - 1) * (y - 1) - rx_sq * ry_sq
+    
+    while y >= 0:
+        plot_ellipse_points(xc, yc, x, y, points)
+        
+        y -= 1
+        dy -= two_rx_sq
+        
+        if p2 > 0:
+            p2 += rx_sq - dy
+        else:
+            x += 1
+            dx += two_ry_sq
+            p2 += dx - dy + rx_sq
+    
+    return points
+
+def midpoint_ellipse_contour(xc, yc, rx, ry):
+    """
+    Same pixel set as midpoint_ellipse, without the repeated pixels on the
+    axes, in order around the ellipse (see contour_from_quadrant).
+    """
+    quadrant_x, quadrant_y = ellipse_quadrant(rx, ry)
+    return contour_from_quadrant(xc, yc, np.column_stack((quadrant_x, quadrant_y)))
+
+def midpoint_ellipse_int(xc, yc, rx, ry):
+    """
+    Integer-only mid-point ellipse.
+    
+    The decision parameters are scaled by 4 so the 0.25 and 0.5 terms of
+    midpoint_ellipse become integers. Python integers never overflow, so the
+    result stays exact for radii where the float path's rx^2 * ry^2 terms no
+    longer fit in a double's mantissa.
+    """
+    points = []
+    
+    x = 0
+    y = ry
+    
+    rx_sq = rx * rx
+    ry_sq = ry * ry
+    two_rx_sq = 2 * rx_sq
+    two_ry_sq = 2 * ry_sq
+    
+    # 4 * (ry^2 - rx^2 * ry + rx^2 / 4)
+    p1 = 4 * ry_sq - 4 * rx_sq * ry + rx_sq
+    
+    dx = two_ry_sq * x
+    dy = two_rx_sq * y
+    
+    while dx < dy:
+        plot_ellipse_points(xc, yc, x, y, points)
+        
+        x += 1
+        dx += two_ry_sq
+        
+        if p1 < 0:
+            p1 += 4 * (dx + ry_sq)
+        else:
+            y -= 1
+            dy -= two_rx_sq
+            p1 += 4 * (dx - dy + ry_sq)
+    
+    # 4 * (ry^2 * (x + 1/2)^2 + rx^2 * (y - 1)^2 - rx^2 * ry^2)
+    p2 = ry_sq * (2 * x + 1) * (2 * x + 1) + 4 * rx_sq * (y - 1) * (y - 1) - 4 * rx_sq * ry_sq
+    
+    while y >= 0:
+        plot_ellipse_points(xc, yc, x, y, points)
+        
+        y -= 1
+        dy -= two_rx_sq
+        
+        if p2 > 0:
+            p2 += 4 * (rx_sq - dy)
+        else:
+            x += 1
+            dx += two_ry_sq
+            p2 += 4 * (dx - dy + rx_sq)
+    
+    return points
@@ -0,0 +1,331 @@
+import numpy as np
+from collections import deque
+from .lines import bresenham_line, dda_line
+
+def load_samples(path, dtype=np.float64):
+    """
+    Memory-map a raw binary file of interleaved (x, y) samples as an N x 2
+    array, so normalize_data can stream it without loading it into memory.
+    """
+    return np.memmap(path, dtype=dtype, mode='r').reshape(-1, 2)
+
+def data_bounds(data, chunk_size=1 << 20):
+    """
+    Min and max of both columns in a single pass over the data.
+    
+    The data is read in chunks and each chunk's min and max are taken while
+    it is still in cache, so a memory-mapped file is only paged in once.
+    """
+    lo = np.full(2, np.inf)
+    hi = np.full(2, -np.inf)
+    
+    for start in range(0, len(data), chunk_size):
+        block = data[start:start + chunk_size]
+        np.minimum(lo, block.min(axis=0), out=lo)
+        np.maximum(hi, block.max(axis=0), out=hi)
+    
+    return lo[0].item(), hi[0].item(), lo[1].item(), hi[1].item()
+
+def normalize_data(data, width, height, margin=50, chunk_size=1 << 20):
+    """
+    Normalize data to fit within the window dimensions.
+    
+    Parameters:
+    data: List of (x, y) tuples or an N x 2 array (e.g. from load_samples)
+    width, height: Window dimensions
+    margin: Margin from window edges
+    chunk_size: Rows processed per vectorized step
+    
+    Returns: (points, bounds) where points is an N x 2 int32 array of pixel
+    coordinates and bounds is (x_min, x_max, y_min, y_max), or None if the
+    data is empty
+    """
+    if not isinstance(data, np.ndarray):
+        data = np.asarray(data, dtype=np.float64)
+    data = data.reshape(-1, 2)
+    
+    normalized = np.empty((len(data), 2), dtype=np.int32)
+    if not len(data):
+        return normalized, None
+    
+    # Find min and max values
+    x_min, x_max, y_min, y_max = data_bounds(data, chunk_size)
+    
+    # Avoid division by zero
+    x_range = x_max - x_min if x_max != x_min else 1
+    y_range = y_max - y_min if y_max != y_min else 1
+    
+    # Available drawing area
+    draw_width = width - 2 * margin
+    draw_height = height - 2 * margin
+    
+    # Normalize to pixel coordinates, truncating like int()
+    for start in range(0, len(data), chunk_size):
+        block = np.asarray(data[start:start + chunk_size], dtype=np.float64)
+        out = normalized[start:start + chunk_size]
+        # Map x from [x_min, x_max] to [margin, width-margin]
+        out[:, 0] = (margin + ((block[:, 0] - x_min) / x_range) * draw_width).astype(np.int32)
+        # Map y from [y_min, y_max] to [height-margin, margin] (inverted for screen coords)
+        out[:, 1] = (height - margin - ((block[:, 1] - y_min) / y_range) * draw_height).astype(np.int32)
+    
+    return normalized, (x_min, x_max, y_min, y_max)
+
+def decimate_minmax(points):
+    """
+    Reduce pixel-space points to at most four per pixel column.
+    
+    Within each run of consecutive points that share a column only the
+    first, lowest, highest and last points are kept, in their original
+    order. Their segments cover exactly the same pixels as the full series,
+    so the rasterized trace is unchanged.
+    """
+    points = np.asarray(points).reshape(-1, 2)
+    if len(points) <= 4:
+        return points
+    
+    x = points[:, 0]
+    y = points[:, 1]
+    
+    starts = np.flatnonzero(np.r_[True, x[1:] != x[:-1]])
+    ends = np.r_[starts[1:], len(points)] - 1
+    
+    # Sorting by (column run, y) puts each run's lowest point first; the
+    # stable sort keeps the earliest index among equal values
+    run = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(points)]))
+    lowest = np.lexsort((y, run))[starts]
+    highest = np.lexsort((-y, run))[starts]
+    
+    keep = np.unique(np.concatenate((starts, ends, lowest, highest)))
+    return points[keep]
+
+def decimate_lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling to threshold points.
+    
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket.
+    """
+    points = np.asarray(points).reshape(-1, 2)
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return points
+    
+    data = points.astype(np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg = data[hi:next_hi].mean(axis=0) if next_hi > hi else data[n - 1]
+        
+        bucket = data[lo:hi]
+        ax, ay = data[a]
+        areas = np.abs((ax - avg[0]) * (bucket[:, 1] - ay) - (ax - bucket[:, 0]) * (avg[1] - ay))
+        
+        a = lo + int(np.argmax(areas))
+        keep[i + 1] = a
+    
+    return points[keep]
+
+def decimate_points(points, mode='minmax', threshold=None):
+    """
+    Decimation stage between normalize_data and generate_graph_lines.
+    
+    Parameters:
+    points: Pixel coordinates from normalize_data
+    mode: 'minmax' (per-column first/min/max/last) or 'lttb'
+    threshold: Output size for 'lttb', defaults to twice the pixel width
+    
+    Returns: Decimated points as an N x 2 array
+    """
+    points = np.asarray(points).reshape(-1, 2)
+    if not len(points):
+        return points
+    
+    if mode == 'lttb':
+        if threshold is None:
+            columns = points[:, 0]
+            threshold = 2 * int(columns.max() - columns.min() + 1)
+        return decimate_lttb(points, threshold)
+    
+    return decimate_minmax(points)
+
+def generate_graph_lines(data_points, algorithm='bresenham'):
+    all_points = []
+    
+    line_func = bresenham_line if algorithm == 'bresenham' else dda_line
+    
+    # Plain ints keep the per-pixel loops off NumPy scalars
+    if isinstance(data_points, np.ndarray):
+        data_points = data_points.tolist()
+    
+    for i in range(len(data_points) - 1):
+        x1, y1 = data_points[i]
+        x2, y2 = data_points[i + 1]
+        
+        line_points = line_func(x1, y1, x2, y2)
+        all_points.extend(line_points)
+    
+    return all_points
+
+class IncrementalGraph:
+    """
+    Live line graph over the most recent `capacity` samples.
+    
+    Samples are written into a fixed ring buffer and drawn in sweep mode:
+    slot i is always at the same x pixel, and the newest sample is left
+    unconnected from the oldest one after it. Appending a sample therefore
+    only rasterizes the one new segment, unless the rolling y-range changes,
+    in which case every segment is re-normalized.
+    """
+    
+    def __init__(self, capacity, width, height, margin=50, algorithm='bresenham'):
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.line_func = bresenham_line if algorithm == 'bresenham' else dda_line
+        
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+        self.y_range = None
+        
+        # Pixel column of every slot never changes
+        draw_width = width - 2 * margin
+        self.slot_x = [int(margin + (i / max(capacity - 1, 1)) * draw_width) for i in range(capacity)]
+        self.slot_y = [0] * capacity
+        
+        # segments[i] holds the pixels from slot i - 1 to slot i
+        self.segments = [[] for _ in range(capacity)]
+        
+        # Monotonic deques of (sequence number, value) for the rolling window
+        self._min = deque()
+        self._max = deque()
+    
+    def _pixel_y(self, value):
+        y_min, y_max = self.y_range
+        y_range = y_max - y_min if y_max != y_min else 1
+        draw_height = self.height - 2 * self.margin
+        return int(self.height - self.margin - ((value - y_min) / y_range) * draw_height)
+    
+    def _connected(self, slot):
+        # The slot after the write head holds the oldest sample, so the
+        # segment into it would join the newest and oldest samples
+        head = (self.count - 1) % self.capacity
+        return 0 < slot < min(self.count, self.capacity) and slot != head + 1
+    
+    def _rasterize(self, slot):
+        if self._connected(slot):
+            self.segments[slot] = self.line_func(
+                self.slot_x[slot - 1], self.slot_y[slot - 1],
+                self.slot_x[slot], self.slot_y[slot]
+            )
+        else:
+            self.segments[slot] = []
+    
+    def _renormalize(self):
+        filled = min(self.count, self.capacity)
+        for slot in range(filled):
+            self.slot_y[slot] = self._pixel_y(self.values[slot])
+        for slot in range(filled):
+            self._rasterize(slot)
+    
+    def append(self, value):
+        """
+        Add one sample. Returns True if the whole graph was re-normalized.
+        """
+        seq = self.count
+        slot = seq % self.capacity
+        
+        self.values[slot] = value
+        self.count += 1
+        
+        # Rolling min/max in amortized O(1): drop dominated values from the
+        # back and samples that left the window from the front
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        
+        oldest = seq - self.capacity + 1
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+        
+        y_range = (self._min[0][1], self._max[0][1])
+        if y_range != self.y_range:
+            self.y_range = y_range
+            self._renormalize()
+            return True
+        
+        self.slot_y[slot] = self._pixel_y(value)
+        self._rasterize(slot)
+        
+        # The old segment leaving this slot now ends at the sweep gap
+        if slot + 1 < self.capacity:
+            self.segments[slot + 1] = []
+        
+        return False
+    
+    def points(self):
+        all_points = []
+        for segment in self.segments:
+            all_points.extend(segment)
+        return all_points
+
+def occupancy_bitmap(width, height):
+    """
+    Empty bit-packed occupancy bitmap, one bit per pixel (MSB first per byte,
+    matching np.unpackbits).
+    """
+    return np.zeros((height, (width + 7) // 8), dtype=np.uint8)
+
+def dedup_points(points, width, height, bitmap=None, output='points'):
+    """
+    Drop repeated pixels, keeping only the first hit per pixel.
+    
+    Parameters:
+    points: List of (x, y) tuples or an N x 2 array
+    width, height: Plot area covered by the bitmap; points outside it are dropped
+    bitmap: Existing occupancy bitmap to update in place, so several calls
+            (e.g. one per series) share one set of already drawn pixels
+    output: 'points' for the surviving points, 'bitmap' for the bitmap
+    
+    Returns: N x 2 int32 array of first hits in their original order, or the
+    occupancy bitmap
+    """
+    if bitmap is None:
+        bitmap = occupancy_bitmap(width, height)
+    
+    points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    x = points[:, 0]
+    y = points[:, 1]
+    
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    points, x, y = points[inside], x[inside], y[inside]
+    
+    byte = x >> 3
+    bit = (0x80 >> (x & 7)).astype(np.uint8)
+    
+    # A point survives if its pixel was not already set and it is the first
+    # occurrence of that pixel within this batch
+    first = np.zeros(len(points), dtype=bool)
+    first[np.unique(y * width + x, return_index=True)[1]] = True
+    keep = first & ((bitmap[y, byte] & bit) == 0)
+    
+    np.bitwise_or.at(bitmap, (y[keep], byte[keep]), bit[keep])
+    
+    if output == 'bitmap':
+        return bitmap
+    
+    return points[keep].astype(np.int32)
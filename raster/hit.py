@@ -0,0 +1,127 @@
+import math
+from bisect import bisect_right
+import numpy as np
+
+class PieHitTester:
+    """
+    Finds the pie sector under a point by bisecting the sorted sector
+    start angles, so a lookup costs O(log n) however many sectors there are.
+    """
+
+    def __init__(self, sectors, cx, cy, radius):
+        """
+        Parameters:
+        sectors: Sector dicts from create_pie_chart or a pie_sectors layout
+        cx, cy, radius: Placement of the chart
+        """
+        if isinstance(sectors, dict):
+            starts = sectors['start_angle'].tolist()
+            end = sectors['end_angle'][-1] if len(starts) else 0.0
+        else:
+            starts = [sector['start_angle'] for sector in sectors]
+            end = sectors[-1]['end_angle'] if sectors else 0.0
+
+        self.cx = cx
+        self.cy = cy
+        self.radius_sq = radius * radius
+        self.starts = starts
+        self.end = float(end)
+
+    def hit(self, x, y):
+        """
+        Returns: index of the sector containing (x, y), or None outside the pie
+        """
+        dx = x - self.cx
+        dy = y - self.cy
+        if not self.starts or dx * dx + dy * dy > self.radius_sq:
+            return None
+
+        # Bring the angle into the [first start, first start + 2 pi) turn
+        first = self.starts[0]
+        angle = first + (math.atan2(dy, dx) - first) % (2 * math.pi)
+        if angle >= self.end:
+            # Inside the rounding gap after the last sector edge
+            return len(self.starts) - 1
+
+        return bisect_right(self.starts, angle) - 1
+
+class PointHitTester:
+    """
+    Nearest-point lookups over a fixed set of screen points.
+
+    Points are indexed twice: sorted by x, for snapping to the sample under
+    the cursor's column, and bucketed into a grid of cell_size pixel cells
+    stored as one array sorted by cell, for the nearest point in 2D. Both
+    lookups are binary searches, so they stay cheap on million-point series.
+    """
+
+    def __init__(self, points, cell_size=16):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.points = points
+        self.cell_size = cell_size
+
+        self.x_order = np.argsort(points[:, 0], kind='stable')
+        self.sorted_x = points[self.x_order, 0]
+
+        if len(points):
+            cells = np.floor(points / cell_size).astype(np.int64)
+            self.origin = cells.min(axis=0)
+            cells -= self.origin
+            self.columns = int(cells[:, 0].max()) + 1
+            self.rows = int(cells[:, 1].max()) + 1
+            keys = cells[:, 1] * self.columns + cells[:, 0]
+        else:
+            self.origin = np.zeros(2, dtype=np.int64)
+            self.columns = self.rows = 0
+            keys = np.zeros(0, dtype=np.int64)
+
+        self.cell_order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.cell_order]
+
+    def nearest_x(self, x):
+        """
+        Returns: index of the point whose x is closest to x, or None if empty
+        """
+        count = len(self.sorted_x)
+        if not count:
+            return None
+
+        i = int(np.searchsorted(self.sorted_x, x))
+        if i == count or (i > 0 and x - self.sorted_x[i - 1] <= self.sorted_x[i] - x):
+            i -= 1
+        return int(self.x_order[i])
+
+    def nearest(self, x, y, max_distance=None):
+        """
+        Returns: index of the point closest to (x, y) no further than
+        max_distance pixels (cell_size when None), or None
+        """
+        if max_distance is None:
+            max_distance = self.cell_size
+        if not self.columns:
+            return None
+
+        reach = int(math.ceil(max_distance / self.cell_size))
+        cell_x = int(math.floor(x / self.cell_size)) - self.origin[0]
+        cell_y = int(math.floor(y / self.cell_size)) - self.origin[1]
+
+        best = None
+        best_sq = max_distance * max_distance
+
+        for row in range(max(cell_y - reach, 0), min(cell_y + reach, self.rows - 1) + 1):
+            for column in range(max(cell_x - reach, 0), min(cell_x + reach, self.columns - 1) + 1):
+                key = row * self.columns + column
+                lo = np.searchsorted(self.sorted_keys, key, side='left')
+                hi = np.searchsorted(self.sorted_keys, key, side='right')
+                if lo == hi:
+                    continue
+
+                candidates = self.cell_order[lo:hi]
+                offsets = self.points[candidates] - (x, y)
+                distance_sq = np.einsum('ij,ij->i', offsets, offsets)
+                i = int(np.argmin(distance_sq))
+                if distance_sq[i] <= best_sq:
+                    best = int(candidates[i])
+                    best_sq = distance_sq[i]
+
+        return best
@@ -0,0 +1,409 @@
+import math
+import numpy as np
+from .point_buffer import write_points
+
+def accumulate(start, inc, count, chunk_size=1 << 16):
+    """
+    Value of `start` after `count` repeated `+= inc` steps, with exactly the
+    rounding of a Python loop. NumPy's cumsum adds sequentially, so it is
+    used to skip steps in C instead of one Python iteration per step.
+    """
+    value = start
+    while count > 0:
+        n = min(count, chunk_size)
+        value = np.cumsum(np.r_[float(value), np.full(n, inc)])[-1].item()
+        count -= n
+    return value
+
+def dda_clip_steps(start, inc, steps, lo, hi):
+    """
+    Conservative range of steps k in [0, steps] where round(start + k * inc)
+    can fall in [lo, hi]. The range is widened by one pixel so accumulated
+    rounding error can never push a visible pixel outside it.
+    """
+    if inc == 0:
+        return (0, steps) if lo - 1 <= start <= hi + 1 else (1, 0)
+    
+    a = (lo - 1 - start) / inc
+    b = (hi + 1 - start) / inc
+    if a > b:
+        a, b = b, a
+    
+    return max(0, math.ceil(a)), min(steps, math.floor(b))
+
+def dda_arrays(x1, y1, x2, y2, clip=None):
+    """
+    Same pixels as dda_line, as x and y int64 arrays.
+    
+    The running position is a sequential cumsum of the increments, which
+    rounds exactly like the += loop in dda_line.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    # dda_line divides by the untruncated step length and emits
+    # int(steps) + 1 pixels, which only differ for non-integer endpoints
+    float_steps = max(abs(dx), abs(dy))
+    steps = int(float_steps)
+    
+    if float_steps == 0:
+        x = np.array([round(x1)], dtype=np.int64)
+        y = np.array([round(y1)], dtype=np.int64)
+    else:
+        x_inc = dx / float_steps
+        y_inc = dy / float_steps
+        first, last = 0, steps
+        
+        if clip is not None:
+            x_first, x_last = dda_clip_steps(x1, x_inc, steps, clip[0], clip[2] - 1)
+            y_first, y_last = dda_clip_steps(y1, y_inc, steps, clip[1], clip[3] - 1)
+            first, last = max(x_first, y_first), min(x_last, y_last)
+        
+        count = max(last - first + 1, 0)
+        x = np.rint(np.cumsum(np.r_[accumulate(x1, x_inc, first), np.full(max(count - 1, 0), x_inc)])[:count])
+        y = np.rint(np.cumsum(np.r_[accumulate(y1, y_inc, first), np.full(max(count - 1, 0), y_inc)])[:count])
+        x = x.astype(np.int64)
+        y = y.astype(np.int64)
+    
+    if clip is not None:
+        inside = (x >= clip[0]) & (x < clip[2]) & (y >= clip[1]) & (y < clip[3])
+        x, y = x[inside], y[inside]
+    
+    return x, y
+
+def dda_line(x1, y1, x2, y2, clip=None, out=None, start=0):
+    """
+    DDA line from (x1, y1) to (x2, y2).
+    
+    clip: Optional (x_min, y_min, x_max, y_max) rectangle with exclusive upper
+    bounds. Stepping starts just before the line enters it and stops just
+    after it leaves, with the running position re-seeded at the entry step,
+    so the visible pixels match the unclipped line exactly.
+    
+    out: Optional interleaved int16/int32 point buffer (see point_buffer).
+    The pixels are written into it from point index start, without building
+    tuples, and the index one past the last written point is returned.
+    """
+    if out is not None:
+        return write_points(out, start, *dda_arrays(x1, y1, x2, y2, clip))
+    
+    points = []
+    
+    dx = x2 - x1
+    dy = y2 - y1
+    
+    # Determine number of steps
+    steps = max(abs(dx), abs(dy))
+    
+    if steps == 0:
+        if clip is not None and not (clip[0] <= x1 < clip[2] and clip[1] <= y1 < clip[3]):
+            return []
+        return [(x1, y1)]
+    
+    # Calculate increment for each step
+    x_inc = dx / steps
+    y_inc = dy / steps
+    
+    # Starting point
+    x, y = x1, y1
+    first, last = 0, int(steps)
+    
+    if clip is not None:
+        x_min, y_min, x_max, y_max = clip
+        
+        # Liang-Barsky on the ideal line, one axis at a time
+        x_first, x_last = dda_clip_steps(x1, x_inc, int(steps), x_min, x_max - 1)
+        y_first, y_last = dda_clip_steps(y1, y_inc, int(steps), y_min, y_max - 1)
+        first, last = max(x_first, y_first), min(x_last, y_last)
+        
+        if first > last:
+            return []
+        
+        x = accumulate(x1, x_inc, first)
+        y = accumulate(y1, y_inc, first)
+    
+    for _ in range(last - first + 1):
+        px, py = round(x), round(y)
+        if clip is None or (x_min <= px < x_max and y_min <= py < y_max):
+            points.append((px, py))
+        x += x_inc
+        y += y_inc
+    
+    return points
+
+def dda_lines(segments, min_active=16):
+    """
+    Rasterize many segments at once with the DDA algorithm.
+    
+    Parameters:
+    segments: N x 4 array of (x1, y1, x2, y2) rows
+    min_active: Once fewer segments than this are still stepping, they are
+                finished one at a time with dda_arrays, so a few long
+                segments do not keep the shared loop running; values
+                below 1 never fall back
+    
+    Returns: (points, offsets) where points is an M x 2 int32 array and the
+    pixels of segment i are points[offsets[i]:offsets[i + 1]]
+    """
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = segments.T
+    
+    dx = x2 - x1
+    dy = y2 - y1
+    
+    # Like dda_line: divide by the untruncated length, emit int(steps) + 1 pixels
+    float_steps = np.maximum(np.abs(dx), np.abs(dy))
+    steps = float_steps.astype(np.int64)
+    
+    offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+    np.cumsum(steps + 1, out=offsets[1:])
+    
+    points = np.empty((offsets[-1], 2), dtype=np.int32)
+    
+    # Zero-length segments emit their start point unchanged
+    nonzero = float_steps > 0
+    safe_steps = np.where(nonzero, float_steps, 1.0)
+    x_inc = np.where(nonzero, dx / safe_steps, 0.0)
+    y_inc = np.where(nonzero, dy / safe_steps, 0.0)
+    
+    # Sort by length so the segments still stepping are always a prefix,
+    # then advance every active segment by one step per iteration. The
+    # running sums are accumulated exactly like dda_line, so rounding
+    # matches pixel for pixel.
+    order = np.argsort(-steps, kind='stable')
+    sorted_steps = steps[order]
+    start = offsets[:-1][order]
+    x = x1[order]
+    y = y1[order]
+    x_inc = x_inc[order]
+    y_inc = y_inc[order]
+    
+    # With no segments left the loop must end even if fallback is disabled
+    min_active = max(min_active, 1)
+    
+    active = len(order)
+    i = 0
+    while active >= min_active:
+        while active and sorted_steps[active - 1] < i:
+            active -= 1
+        if active < min_active:
+            break
+        
+        idx = start[:active] + i
+        points[idx, 0] = np.rint(x[:active])
+        points[idx, 1] = np.rint(y[:active])
+        
+        x[:active] += x_inc[:active]
+        y[:active] += y_inc[:active]
+        i += 1
+    
+    # The few (longest) segments left are rasterized whole with a cumsum,
+    # rewriting their first i pixels with the same values
+    for j in order[:active]:
+        px, py = dda_arrays(*segments[j])
+        points[offsets[j]:offsets[j + 1], 0] = px
+        points[offsets[j]:offsets[j + 1], 1] = py
+    
+    return points, offsets
+
+def clip_steps(major, major_step, minor, minor_step, d_major, d_minor, major_range, minor_range):
+    """
+    Range of major-axis steps k for which a Bresenham pixel lies inside a
+    clip rectangle (Liang-Barsky solved exactly in integers).
+    
+    After k steps the minor-axis offset is
+    j(k) = (2 * d_minor * k + d_major) // (2 * d_major), which never decreases,
+    so each bound on the minor axis turns into a bound on k.
+    
+    Returns: (first, last) inclusive, with first > last if nothing is visible
+    """
+    first, last = 0, d_major
+    
+    lo, hi = major_range
+    if major_step > 0:
+        first, last = max(first, lo - major), min(last, hi - major)
+    else:
+        first, last = max(first, major - hi), min(last, major - lo)
+    
+    lo, hi = minor_range
+    if minor_step > 0:
+        j_lo, j_hi = lo - minor, hi - minor
+    else:
+        j_lo, j_hi = minor - hi, minor - lo
+    
+    if d_minor == 0:
+        if not j_lo <= 0 <= j_hi:
+            return 1, 0
+        return first, last
+    
+    # Smallest k with j(k) >= t is ceil((2 * d_major * t - d_major) / (2 * d_minor))
+    def first_step(t):
+        return -((d_major - 2 * d_major * t) // (2 * d_minor))
+    
+    first = max(first, first_step(j_lo))
+    last = min(last, first_step(j_hi + 1) - 1)
+    
+    return first, last
+
+def bresenham_arrays(x1, y1, x2, y2, clip=None):
+    """
+    Same pixels as bresenham_line, as x and y int64 arrays.
+    
+    The minor-axis offset after k steps has the closed form
+    (2 * d_minor * k + d_major) // (2 * d_major), so the whole (clipped)
+    range of steps is computed at once instead of walked pixel by pixel.
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    
+    x_step = 1 if x2 > x1 else -1
+    y_step = 1 if y2 > y1 else -1
+    
+    if dx > dy:
+        first, last = 0, dx
+        if clip is not None:
+            first, last = clip_steps(x1, x_step, y1, y_step, dx, dy,
+                                     (clip[0], clip[2] - 1), (clip[1], clip[3] - 1))
+        k = np.arange(first, last + 1, dtype=np.int64)
+        return x1 + x_step * k, y1 + y_step * ((2 * dy * k + dx) // (2 * dx))
+    
+    first, last = 0, dy
+    if clip is not None:
+        first, last = clip_steps(y1, y_step, x1, x_step, dy, dx,
+                                 (clip[1], clip[3] - 1), (clip[0], clip[2] - 1))
+    k = np.arange(first, last + 1, dtype=np.int64)
+    minor = (2 * dx * k + dy) // (2 * dy) if dy else k * 0
+    return x1 + x_step * minor, y1 + y_step * k
+
+def bresenham_line(x1, y1, x2, y2, clip=None, out=None, start=0):
+    """
+    Bresenham line from (x1, y1) to (x2, y2).
+    
+    clip: Optional (x_min, y_min, x_max, y_max) rectangle with exclusive upper
+    bounds, e.g. (0, 0, width, height). Only pixels inside it are produced;
+    stepping starts at the first visible pixel with the decision parameter
+    re-seeded there, so the visible pixels match the unclipped line exactly.
+    
+    out: Optional interleaved int16/int32 point buffer (see point_buffer).
+    The pixels are written into it from point index start, without building
+    tuples, and the index one past the last written point is returned.
+    """
+    if out is not None:
+        return write_points(out, start, *bresenham_arrays(x1, y1, x2, y2, clip))
+    
+    points = []
+    
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    
+    x_step = 1 if x2 > x1 else -1
+    y_step = 1 if y2 > y1 else -1
+    
+    x, y = x1, y1
+    
+    # Case 1: |m| < 1
+    if dx > dy:
+        p = 2 * dy - dx  # Initial decision parameter
+        steps = dx + 1
+        
+        if clip is not None:
+            first, last = clip_steps(x1, x_step, y1, y_step, dx, dy,
+                                     (clip[0], clip[2] - 1), (clip[1], clip[3] - 1))
+            # Jump to the first visible pixel and re-seed p there
+            j = (2 * dy * first + dx) // (2 * dx)
+            x = x1 + x_step * first
+            y = y1 + y_step * j
+            p += 2 * dy * first - 2 * dx * j
+            steps = max(last - first + 1, 0)
+        
+        for _ in range(steps):
+            points.append((x, y))
+            
+            if p >= 0:
+                y += y_step
+                p += 2 * (dy - dx)
+            else:
+                p += 2 * dy
+            
+            x += x_step
+    
+    # Case 2: |m| >= 1
+    else:
+        p = 2 * dx - dy  # Initial decision parameter
+        steps = dy + 1
+        
+        if clip is not None:
+            first, last = clip_steps(y1, y_step, x1, x_step, dy, dx,
+                                     (clip[1], clip[3] - 1), (clip[0], clip[2] - 1))
+            j = (2 * dx * first + dy) // (2 * dy) if dy else 0
+            x = x1 + x_step * j
+            y = y1 + y_step * first
+            p += 2 * dx * first - 2 * dy * j
+            steps = max(last - first + 1, 0)
+        
+        for _ in range(steps):
+            points.append((x, y))
+            
+            if p >= 0:
+                x += x_step
+                p += 2 * (dx - dy)
+            else:
+                p += 2 * dx
+            
+            y += y_step
+    
+    return points
+
+def bresenham_runs(x1, y1, x2, y2):
+    """
+    Bresenham line as runs of pixels instead of individual points.
+    
+    Returns: (runs, steep). For shallow lines each run is (x, y, length)
+    covering x .. x + length - 1 on row y; for steep lines each run is
+    (x, y, length) covering y .. y + length - 1 in column x.
+    """
+    runs = []
+    
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    
+    x_step = 1 if x2 > x1 else -1
+    y_step = 1 if y2 > y1 else -1
+    
+    steep = dx <= dy
+    
+    # Swap roles so the loop below always walks the major axis
+    if steep:
+        major, minor = y1, x1
+        d_major, d_minor = dy, dx
+        major_step, minor_step = y_step, x_step
+    else:
+        major, minor = x1, y1
+        d_major, d_minor = dx, dy
+        major_step, minor_step = x_step, y_step
+    
+    p = 2 * d_minor - d_major  # Initial decision parameter
+    remaining = d_major + 1
+    
+    while remaining > 0:
+        # Pixels stay on this row until p becomes non-negative, which
+        # happens after ceil(-p / 2*d_minor) more steps along the major axis
+        if d_minor == 0:
+            length = remaining
+        elif p >= 0:
+            length = 1
+        else:
+            length = 1 + (-p + 2 * d_minor - 1) // (2 * d_minor)
+        length = min(length, remaining)
+        
+        start = major if major_step > 0 else major - length + 1
+        if steep:
+            runs.append((minor, start, length))
+        else:
+            runs.append((start, minor, length))
+        
+        p += 2 * d_minor * length - 2 * d_major
+        major += major_step * length
+        minor += minor_step
+        remaining -= length
+    
+    return runs, steep
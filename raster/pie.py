@@ -0,0 +1,271 @@
+import math
+import numpy as np
+from functools import lru_cache
+from .circle import midpoint_circle_spans
+
+# Largest allowed distance in pixels between an arc and its chords
+ARC_MAX_ERROR = 0.25
+
+def arc_segments(radius, angle_span=2 * math.pi, max_error=ARC_MAX_ERROR):
+    """
+    Fewest chords that approximate an arc within max_error pixels.
+    
+    A chord spanning angle t deviates from the arc by r * (1 - cos(t / 2)),
+    so each chord may span at most 2 * acos(1 - max_error / r).
+    """
+    if radius <= max_error:
+        return 1
+    
+    step = 2 * math.acos(1 - max_error / radius)
+    return max(int(math.ceil(abs(angle_span) / step)), 1)
+
+@lru_cache(maxsize=None)
+def angle_table(segments):
+    """
+    Unit cos/sin table of `segments` evenly spaced angles starting at
+    12 o'clock, shared by every sector's fill and outline.
+    """
+    angles = -math.pi / 2 + 2 * math.pi * np.arange(segments) / segments
+    table = np.column_stack((np.cos(angles), np.sin(angles)))
+    table.setflags(write=False)
+    return table
+
+@lru_cache(maxsize=32)
+def pie_geometry(data, cx, cy, radius, segments=None):
+    """
+    Tessellate every sector of a pie chart into one vertex array.
+    
+    Parameters:
+    data: Tuple of sector values
+    cx, cy, radius: Placement of the chart
+    segments: Number of arc vertices in a full circle, chosen from the
+              radius and ARC_MAX_ERROR when None
+    
+    Returns: (vertices, ranges) where vertices is a float32 array and
+    ranges[i] = (first, count) covers [center, arc...] of sector i, drawn as
+    GL_TRIANGLE_FAN for the fill and GL_LINE_LOOP for the outline. Results
+    are cached, so the geometry is only rebuilt when an argument changes.
+    """
+    if segments is None:
+        segments = max(arc_segments(radius), 3)
+    
+    values = np.asarray(data, dtype=np.float64)
+    step = 2 * math.pi / segments
+    start = -math.pi / 2
+    
+    # Same running sum as create_pie_chart, so sector boundaries agree
+    boundaries = np.cumsum(np.r_[start, values / values.sum() * 2 * math.pi])
+    edges = np.column_stack((np.cos(boundaries), np.sin(boundaries)))
+    table = angle_table(segments)
+    
+    blocks = []
+    ranges = []
+    first = 0
+    for i in range(len(values)):
+        # Table angles strictly inside the sector, between its exact edges
+        lo = int(math.floor((boundaries[i] - start) / step)) + 1
+        hi = int(math.ceil((boundaries[i + 1] - start) / step)) - 1
+        inner = table[max(lo, 0):min(hi, segments - 1) + 1]
+        
+        block = np.vstack(((0.0, 0.0), edges[i], inner, edges[i + 1]))
+        blocks.append(block)
+        ranges.append((first, len(block)))
+        first += len(block)
+    
+    if blocks:
+        vertices = (np.vstack(blocks) * radius + (cx, cy)).astype(np.float32)
+    else:
+        vertices = np.empty((0, 2), dtype=np.float32)
+    vertices.setflags(write=False)
+    
+    return vertices, tuple(ranges)
+
+def pie_pixels(data, cx, cy, radius, clip=None):
+    """
+    Pixels of a filled pie chart and the sector each one belongs to.
+    
+    The disc is filled from midpoint_circle_spans, so it matches the circle
+    outline, and every pixel is assigned to a sector by looking its angle
+    up in the running sum of sector angles used by create_pie_chart.
+    
+    Parameters:
+    data: Sequence of sector values
+    cx, cy, radius: Placement of the chart
+    clip: Optional (x0, y0, x1, y1) rectangle with exclusive upper bounds
+    
+    Returns: (x, y, sector) int64 arrays
+    """
+    spans = midpoint_circle_spans(cx, cy, radius).astype(np.int64)
+    y = spans[:, 0]
+    x_left = spans[:, 1]
+    x_right = spans[:, 2]
+    
+    if clip is not None:
+        x_left = np.maximum(x_left, clip[0])
+        x_right = np.minimum(x_right, clip[2] - 1)
+        keep = (y >= clip[1]) & (y < clip[3]) & (x_left <= x_right)
+        y, x_left, x_right = y[keep], x_left[keep], x_right[keep]
+    
+    lengths = x_right - x_left + 1
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    x = np.repeat(x_left, lengths) + np.arange(lengths.sum()) - starts
+    y = np.repeat(y, lengths)
+    
+    values = np.asarray(data, dtype=np.float64)
+    boundaries = np.cumsum(values / values.sum() * 2 * math.pi)
+    
+    # Angle measured from 12 o'clock, increasing the same way as the sectors
+    angles = np.mod(np.arctan2(y - cy, x - cx) + math.pi / 2, 2 * math.pi)
+    sector = np.minimum(np.searchsorted(boundaries, angles, side='right'), len(values) - 1)
+    
+    return x, y, sector
+
+def pie_sectors(data, radius, min_arc=1.0):
+    """
+    Struct-of-arrays sector layout of a pie chart.
+    
+    Sectors whose arc at the rim is shorter than min_arc pixels are merged
+    into one "other" sector placed last, as long as there are at least two
+    of them; pass min_arc=0 to keep every sector.
+    
+    Returns: dict of equal-length arrays 'value', 'percentage',
+    'start_angle', 'end_angle', 'mid_angle' and 'index', where index is the
+    position of the sector's value in data, or -1 for the "other" sector.
+    Angles start at 12 o'clock and use the same running sum as
+    create_pie_chart.
+    """
+    values = np.asarray(data, dtype=np.float64).reshape(-1)
+    index = np.arange(len(values))
+    # Sequential like sum(data); ndarray.sum() adds pairwise and can differ
+    total = np.cumsum(values)[-1] if len(values) else 0.0
+    
+    small = values / total * 2 * math.pi * radius < min_arc
+    if np.count_nonzero(small) > 1:
+        index = np.r_[index[~small], -1]
+        values = np.r_[values[~small], values[small].sum()]
+    
+    angle_size = (values / total) * 2 * math.pi
+    start_angle = np.cumsum(np.r_[-math.pi / 2, angle_size])[:-1]
+    
+    return {
+        'value': values,
+        'percentage': (values / total) * 100,
+        'start_angle': start_angle,
+        'end_angle': start_angle + angle_size,
+        'mid_angle': start_angle + angle_size / 2,
+        'index': index
+    }
+
+def pie_triangles(sectors, cx, cy, radius, colors, outline_color=(0.2, 0.2, 0.2),
+                  line_width=2.0, other_color=(0.5, 0.5, 0.5)):
+    """
+    Tessellate a whole pie chart, fills and outlines, into one triangle list.
+    
+    The rim is split at the ARC_MAX_ERROR angle table plus every sector
+    edge, each piece becomes one fill triangle from the center, and the rim
+    and radial edges become line_width wide quads drawn after the fills.
+    
+    Parameters:
+    sectors: Layout from pie_sectors
+    colors: Color of every value in the original data, looked up through
+            sectors['index']; the "other" sector uses other_color
+    
+    Returns: M x 5 float32 array of interleaved (x, y, r, g, b) vertices,
+    three per triangle, for a single GL_TRIANGLES draw
+    """
+    edges = np.r_[sectors['start_angle'], sectors['end_angle'][-1:]]
+    if not len(sectors['value']):
+        return np.empty((0, 5), dtype=np.float32)
+    
+    palette = np.vstack((np.asarray(colors, dtype=np.float64).reshape(-1, 3), other_color))
+    sector_colors = palette[sectors['index']]
+    
+    segments = max(arc_segments(radius), 3)
+    table = -math.pi / 2 + 2 * math.pi * np.arange(segments + 1) / segments
+    angles = np.unique(np.r_[table[(table > edges[0]) & (table < edges[-1])], edges])
+    
+    rim = np.column_stack((np.cos(angles), np.sin(angles)))
+    owner = np.searchsorted(edges, (angles[:-1] + angles[1:]) / 2, side='right') - 1
+    owner = np.clip(owner, 0, len(sector_colors) - 1)
+    
+    # Fill: (center, rim k, rim k + 1) in the color of the sector holding it
+    fill = np.empty((len(angles) - 1, 3, 2))
+    fill[:, 0] = (0.0, 0.0)
+    fill[:, 1] = rim[:-1] * radius
+    fill[:, 2] = rim[1:] * radius
+    fill_colors = np.repeat(sector_colors[owner], 3, axis=0)
+    
+    half = line_width / 2
+    inner = rim * (radius - half)
+    outer = rim * (radius + half)
+    
+    # Rim outline: one quad (two triangles) per rim piece
+    arc = np.stack((inner[:-1], outer[:-1], outer[1:], inner[:-1], outer[1:], inner[1:]), axis=1)
+    
+    # Radial outline: one quad from the center out along every sector edge
+    direction = np.column_stack((np.cos(edges[:-1]), np.sin(edges[:-1])))
+    normal = direction[:, ::-1] * (-half, half)
+    tip = direction * radius
+    radial = np.stack((normal * -1, normal, tip + normal, normal * -1, tip + normal, tip - normal), axis=1)
+    
+    outline = np.concatenate((arc.reshape(-1, 2), radial.reshape(-1, 2)))
+    
+    vertices = np.empty((len(fill) * 3 + len(outline), 5), dtype=np.float32)
+    vertices[:, :2] = np.concatenate((fill.reshape(-1, 2), outline)) + (cx, cy)
+    vertices[:len(fill_colors), 2:] = fill_colors
+    vertices[len(fill_colors):, 2:] = outline_color
+    
+    return vertices
+
+def layout_sectors(layout, labels, colors, other_label='Other', other_color=(0.5, 0.5, 0.5)):
+    """
+    Sector dicts, as returned by create_pie_chart (without geometry), for
+    the sectors of a pie_sectors layout, so labels and legends list the
+    same sectors that pie_triangles draws.
+    """
+    sectors = []
+    columns = zip(layout['index'].tolist(), layout['value'].tolist(), layout['percentage'].tolist(),
+                  layout['start_angle'].tolist(), layout['end_angle'].tolist(), layout['mid_angle'].tolist())
+    
+    for index, value, percentage, start_angle, end_angle, mid_angle in columns:
+        sectors.append({
+            'value': value,
+            'percentage': percentage,
+            'label': labels[index] if index >= 0 else other_label,
+            'color': colors[index] if index >= 0 else other_color,
+            'start_angle': start_angle,
+            'end_angle': end_angle,
+            'mid_angle': mid_angle
+        })
+    
+    return sectors
+
+def create_pie_chart(data, labels, colors, cx, cy, radius):
+    total = sum(data)
+    sectors = []
+    
+    current_angle = -math.pi / 2  # Start at top (12 o'clock position)
+    
+    for i, (value, label, color) in enumerate(zip(data, labels, colors)):
+        percentage = (value / total) * 100
+        angle_size = (value / total) * 2 * math.pi
+        
+        sector_info = {
+            'value': value,
+            'percentage': percentage,
+            'label': label,
+            'color': color,
+            'start_angle': current_angle,
+            'end_angle': current_angle + angle_size,
+            'mid_angle': current_angle + angle_size / 2
+        }
+        
+        sectors.append(sector_info)
+        current_angle += angle_size
+    
+    if sectors:
+        vertices, ranges = pie_geometry(tuple(data), cx, cy, radius)
+        for sector, (first, count) in zip(sectors, ranges):
+            sector['geometry'] = (vertices, first, count)
+    
+    return sectors
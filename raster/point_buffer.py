@@ -0,0 +1,49 @@
+from array import array
+import numpy as np
+
+def point_buffer(capacity, typecode='i'):
+    """
+    Zeroed interleaved x, y buffer for `capacity` points.
+
+    typecode: 'h' for int16 or 'i' for int32 coordinates. The buffer is a
+    plain array.array, so it costs 4 or 8 bytes per point and can be handed
+    to glBufferData / PointRenderer.add without copying.
+    """
+    return array(typecode, bytes(2 * capacity * array(typecode).itemsize))
+
+def point_view(out):
+    """
+    Writable N x 2 NumPy view of an interleaved point buffer (array.array,
+    NumPy array or any writable buffer), sharing its memory.
+    """
+    if isinstance(out, np.ndarray):
+        view = out
+    else:
+        view = np.frombuffer(out, dtype=np.dtype(memoryview(out).format))
+    return view.reshape(-1, 2)
+
+def write_points(out, start, x, y):
+    """
+    Write coordinate arrays into out at point index start.
+
+    Returns: index one past the last point written
+    """
+    view = point_view(out)
+    end = start + len(x)
+    if end > len(view):
+        raise ValueError(f"point buffer too small: need {end} points, have {len(view)}")
+
+    view[start:end, 0] = x
+    view[start:end, 1] = y
+    return end
+
+def line_capacity(x1, y1, x2, y2):
+    return max(abs(x2 - x1), abs(y2 - y1)) + 1
+
+def circle_capacity(r):
+    # 8 points per octant step; the loop runs about r / sqrt(2) + 1 times
+    return 8 * (int(r * 0.7072) + 2)
+
+def ellipse_capacity(rx, ry):
+    # 4 points per step; x and y each change at most once per step
+    return 4 * (rx + ry + 2)
@@ -0,0 +1,88 @@
+import time
+from lazy_gl import glfw
+import instrumentation
+
+class RenderLoop:
+    """
+    Event-driven replacement for the demos' busy poll/redraw loops.
+
+    A frame is only drawn when the scene is dirty: on the first frame, on
+    resize or expose events, or after mark_dirty() is called for a data
+    change. Otherwise the loop blocks in glfw.wait_events, so an idle window
+    uses next to no CPU.
+    """
+
+    def __init__(self, window, draw, max_fps=None, timeout=None, update=None):
+        """
+        Parameters:
+        window: GLFW window whose context is current
+        draw: Callable that renders one frame (without swapping buffers)
+        max_fps: Optional cap on redraws per second
+        timeout: Seconds to wait for events before calling update, or None
+                 to wait indefinitely
+        update: Optional callable run after every wake-up; returning True
+                marks the scene dirty (e.g. new samples arrived)
+        """
+        self.window = window
+        self.draw = draw
+        if instrumentation.stats is not None:
+            self.draw = instrumentation.stats.wrap_scope(getattr(draw, '__name__', 'draw'), draw)
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.timeout = timeout
+        self.update = update
+        self.dirty = True
+        self.frames = 0
+        self._last_frame = 0.0
+
+        glfw.set_window_refresh_callback(window, self._on_refresh)
+        glfw.set_framebuffer_size_callback(window, self._on_resize)
+
+    def mark_dirty(self):
+        self.dirty = True
+        # Wake the loop if it is blocked waiting for events
+        glfw.post_empty_event()
+
+    def _on_refresh(self, window):
+        self.dirty = True
+
+    def _on_resize(self, window, width, height):
+        self.dirty = True
+
+    def _wait(self, timeout):
+        if timeout is None:
+            glfw.wait_events()
+        else:
+            glfw.wait_events_timeout(max(timeout, 0.0))
+
+    def run(self):
+        while not glfw.window_should_close(self.window):
+            if self.update is not None and self.update():
+                self.dirty = True
+
+            if self.dirty:
+                remaining = self._last_frame + self.min_interval - time.perf_counter()
+                if remaining > 0:
+                    # Frame cap: keep handling events until the next frame is due
+                    self._wait(remaining)
+                    continue
+
+                self.dirty = False
+                start = time.perf_counter()
+                self.draw()
+                drawn = time.perf_counter()
+                glfw.swap_buffers(self.window)
+                self._last_frame = time.perf_counter()
+                self.frames += 1
+
+                if instrumentation.stats is not None:
+                    instrumentation.stats.record_frame(drawn - start, self._last_frame - drawn)
+
+            self._wait(self.timeout)
+
+def run(window, draw, max_fps=None, timeout=None, update=None):
+    """
+    Run a RenderLoop until the window is closed and return it.
+    """
+    loop = RenderLoop(window, draw, max_fps, timeout, update)
+    loop.run()
+    return loop
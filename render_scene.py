@@ -0,0 +1,260 @@
+import argparse
+import gzip
+import sys
+import time
+from functools import lru_cache
+import numpy as np
+from raster.lines import bresenham_arrays, dda_arrays
+from raster.circle import circle_offset_cache
+from raster.ellipse import midpoint_ellipse_int
+from raster.pie import pie_pixels
+from framebuffer import Framebuffer, to_rgba8
+
+# Default sector colors for pies until a palette command sets others
+PIE_COLORS = [
+    (1.0, 0.2, 0.2),   # Red
+    (0.2, 0.8, 0.2),   # Green
+    (0.2, 0.4, 1.0),   # Blue
+    (1.0, 0.8, 0.2),   # Yellow
+    (1.0, 0.4, 0.8),   # Pink
+]
+
+# Buffered pixels are scattered into the framebuffer once this many pile up
+FLUSH_POINTS = 1 << 20
+
+SCENE_FORMAT = """\
+Scene files hold one command per line; '#' starts a comment.
+
+  size W H                  framebuffer size (before any drawing)
+  clear R G B [A]           fill the framebuffer
+  color R G B [A]           color of the primitives that follow
+  line X1 Y1 X2 Y2          Bresenham line
+  dda X1 Y1 X2 Y2           DDA line
+  circle XC YC R            mid-point circle
+  ellipse XC YC RX RY       mid-point ellipse
+  polyline X1 Y1 X2 Y2 ...  connected Bresenham lines
+  palette R G B R G B ...   sector colors of the pies that follow, cycled
+  pie CX CY R V1 V2 ...     filled pie chart with one sector per value
+
+Colors are floats in [0, 1] and coordinates are integer pixels with the
+origin at the top left. Files ending in .gz are decompressed on the fly.
+"""
+
+# command -> (minimum argument count, argument count multiple, number type)
+COMMANDS = {
+    'size': (2, 1, int),
+    'clear': (3, 1, float),
+    'color': (3, 1, float),
+    'line': (4, 1, int),
+    'dda': (4, 1, int),
+    'circle': (3, 1, int),
+    'ellipse': (4, 1, int),
+    'polyline': (4, 2, int),
+    'palette': (3, 3, float),
+    'pie': (4, 1, float),
+}
+
+# command -> maximum argument count, for the fixed-size commands
+MAX_ARGS = {'size': 2, 'clear': 4, 'color': 4, 'line': 4, 'dda': 4, 'circle': 3, 'ellipse': 4}
+
+# command -> number of leading integer arguments of a float command
+INT_ARGS = {'pie': 3}
+
+def read_scene(lines):
+    """
+    Parse scene lines one at a time.
+
+    Yields: (line_number, command, values) for every non-empty line. Raises
+    ValueError naming the line for unknown commands or bad arguments.
+    """
+    for number, line in enumerate(lines, 1):
+        fields = line.split('#', 1)[0].split()
+        if not fields:
+            continue
+
+        command = fields[0]
+        spec = COMMANDS.get(command)
+        if spec is None:
+            raise ValueError(f"line {number}: unknown command {command!r}")
+
+        min_args, multiple, kind = spec
+        count = len(fields) - 1
+        if count < min_args or count > MAX_ARGS.get(command, count) or count % multiple:
+            raise ValueError(f"line {number}: wrong number of arguments for {command!r}")
+
+        ints = INT_ARGS.get(command, 0)
+        try:
+            values = [int(field) if i < ints else kind(field) for i, field in enumerate(fields[1:])]
+        except ValueError:
+            raise ValueError(f"line {number}: bad number in {line.strip()!r}") from None
+
+        yield number, command, values
+
+@lru_cache(maxsize=4096)
+def ellipse_offsets(rx, ry):
+    # Like circles, an ellipse's pixel pattern only depends on its radii
+    offsets = np.array(midpoint_ellipse_int(0, 0, rx, ry), dtype=np.int64).reshape(-1, 2)
+    offsets.setflags(write=False)
+    return offsets
+
+class SceneRenderer:
+    """
+    Rasterize scene commands into a Framebuffer as they arrive.
+
+    Pixels of consecutive primitives sharing a color are buffered and
+    written in one scatter, so memory stays bounded by FLUSH_POINTS however
+    many primitives the scene holds. Drawing order is kept: the buffer is
+    flushed whenever the color changes and before pies and clears.
+    """
+
+    def __init__(self, width, height, clear_color=(0.0, 0.0, 0.0, 1.0)):
+        self.width = width
+        self.height = height
+        self.clear_color = clear_color
+        self.fb = None
+        self.color = (1.0, 1.0, 1.0)
+        self.palette = PIE_COLORS
+        self.primitives = 0
+        self._x = []
+        self._y = []
+        self._pending = 0
+
+    def framebuffer(self):
+        if self.fb is None:
+            self.fb = Framebuffer(self.width, self.height, self.clear_color)
+        return self.fb
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        x = np.concatenate(self._x)
+        y = np.concatenate(self._y)
+        self._x.clear()
+        self._y.clear()
+        self._pending = 0
+
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        # One 32-bit store per pixel instead of four byte stores
+        words = self.framebuffer().pixels.view(np.uint32)[:, :, 0]
+        words[y[inside], x[inside]] = to_rgba8(self.color).view(np.uint32)[0]
+
+    def add(self, x, y):
+        self._x.append(x)
+        self._y.append(y)
+        self._pending += len(x)
+        if self._pending >= FLUSH_POINTS:
+            self.flush()
+
+    def command(self, command, values):
+        clip = (0, 0, self.width, self.height)
+
+        if command == 'size':
+            if self.fb is not None:
+                raise ValueError("'size' must come before any drawing")
+            if min(values) <= 0:
+                raise ValueError("size must be positive")
+            self.width, self.height = values
+            return
+
+        if command == 'clear':
+            self.flush()
+            self.framebuffer().clear(values)
+            return
+
+        if command == 'color':
+            if tuple(values) != self.color:
+                self.flush()
+                self.color = tuple(values)
+            return
+
+        if command == 'palette':
+            self.palette = [tuple(values[i:i + 3]) for i in range(0, len(values), 3)]
+            return
+
+        self.primitives += 1
+
+        if command == 'line':
+            self.add(*bresenham_arrays(*values, clip=clip))
+        elif command == 'dda':
+            self.add(*dda_arrays(*values, clip=clip))
+        elif command == 'circle':
+            xc, yc, r = values
+            if r < 0:
+                raise ValueError("circle radius must not be negative")
+            offsets = circle_offset_cache.get(r)
+            self.add(offsets[:, 0] + xc, offsets[:, 1] + yc)
+        elif command == 'ellipse':
+            xc, yc, rx, ry = values
+            if rx < 0 or ry < 0:
+                raise ValueError("ellipse radii must not be negative")
+            offsets = ellipse_offsets(rx, ry)
+            self.add(offsets[:, 0] + xc, offsets[:, 1] + yc)
+        elif command == 'polyline':
+            for i in range(0, len(values) - 2, 2):
+                self.add(*bresenham_arrays(*values[i:i + 4], clip=clip))
+        elif command == 'pie':
+            cx, cy, radius = values[:3]
+            data = values[3:]
+            if radius < 0:
+                raise ValueError("pie radius must not be negative")
+            if min(data) < 0 or sum(data) <= 0:
+                raise ValueError("pie values must not be negative and must have a positive total")
+            self.flush()
+
+            x, y, sector = pie_pixels(data, cx, cy, radius, clip)
+            palette = np.array([to_rgba8(self.palette[i % len(self.palette)]) for i in range(len(data))])
+            self.framebuffer().pixels[y, x] = palette[sector]
+
+    def finish(self):
+        self.flush()
+        return self.framebuffer()
+
+def render_scene(lines, width=1000, height=700, clear_color=(0.0, 0.0, 0.0, 1.0)):
+    """
+    Render an iterable of scene lines (see SCENE_FORMAT).
+
+    Returns: (Framebuffer, number of primitives drawn)
+    """
+    renderer = SceneRenderer(width, height, clear_color)
+    for number, command, values in read_scene(lines):
+        try:
+            renderer.command(command, values)
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
+    return renderer.finish(), renderer.primitives
+
+def open_scene(path):
+    if path == '-':
+        return sys.stdin
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt')
+    return open(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a scene file to an image without opening a window",
+        epilog=SCENE_FORMAT, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scene', help="scene file, '-' for stdin")
+    parser.add_argument('-o', '--output', default='scene.png', help="output image (.png or .ppm)")
+    parser.add_argument('--width', type=int, default=1000, help="framebuffer width unless the scene sets a size")
+    parser.add_argument('--height', type=int, default=700, help="framebuffer height unless the scene sets a size")
+    args = parser.parse_args(argv)
+    if args.width <= 0 or args.height <= 0:
+        parser.error("--width and --height must be positive")
+
+    start = time.perf_counter()
+    try:
+        with open_scene(args.scene) as f:
+            fb, primitives = render_scene(f, args.width, args.height)
+        fb.save(args.output)
+    except (OSError, ValueError) as e:
+        print(f"{args.scene}: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Rendered {primitives} primitives ({fb.width}x{fb.height}) to {args.output} "
+          f"in {time.perf_counter() - start:.2f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())